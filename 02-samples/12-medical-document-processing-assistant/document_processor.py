@@ -1,12 +1,110 @@
 #!/usr/bin/env python3
 
+import asyncio
+import io
 import os
 import json
 import boto3
 import base64
+import hashlib
+import tempfile
+import threading
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
 from pypdf import PdfReader
 from strands import tool
 
+# blake3 hashes with SIMD, ~10x faster than sha256 on large files; either way
+# the key is the file's content, so renamed or re-uploaded copies still hit.
+try:
+    from blake3 import blake3 as _content_hasher
+except ImportError:
+    _content_hasher = hashlib.sha256
+
+# orjson serializes the request envelope (which carries a huge base64 string)
+# 3-10x faster than stdlib json and emits bytes, which invoke_model accepts
+# directly; it also parses the response bytes without a str intermediate.
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+    _json_loads = json.loads
+
+def _json_error(message: str) -> str:
+    """Serialize an error payload to the str the tool contract expects."""
+    return _json_dumps({"error": message}).decode('utf-8')
+
+# pybase64 encodes with SIMD (libbase64), roughly 4-8x faster than the stdlib
+# on large scanned PDFs; fall back to the stdlib encoder if it's not installed.
+try:
+    import pybase64
+    _b64encode = pybase64.b64encode
+except ImportError:
+    _b64encode = base64.b64encode
+
+# Creating a boto3 client loads service models from JSON (~50ms) and builds a
+# fresh botocore session per call; share one client so every invocation reuses
+# the same urllib3 connection pool and warm TLS sessions.
+_bedrock_client = None
+_bedrock_client_lock = threading.Lock()
+
+def _get_bedrock_client():
+    """Return the shared bedrock-runtime client, creating it on first use."""
+    global _bedrock_client
+    if _bedrock_client is None:
+        with _bedrock_client_lock:
+            if _bedrock_client is None:
+                _bedrock_client = boto3.client(
+                    service_name='bedrock-runtime',
+                    region_name=os.environ.get('AWS_REGION', 'us-east-1'),
+                    config=Config(
+                        max_pool_connections=50,
+                        retries={'mode': 'adaptive', 'max_attempts': 3},
+                        tcp_keepalive=True,
+                    ),
+                )
+    return _bedrock_client
+
+# Two-level result cache: an in-memory dict for repeat calls within one
+# session, backed by an on-disk store so results survive restarts. A cached
+# hit skips a 2-30s (and billable) Bedrock round trip.
+_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'medical_doc_processor')
+_memory_cache = {}
+_MEMORY_CACHE_MAX = 64
+
+def _cache_lookup(key: str):
+    """Return a cached extraction result for the content key, or None."""
+    if key in _memory_cache:
+        return _memory_cache[key]
+    cache_path = os.path.join(_CACHE_DIR, f"{key}.txt")
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as cached:
+            result = cached.read()
+    except OSError:
+        return None
+    _cache_store_memory(key, result)
+    return result
+
+def _cache_store(key: str, result: str) -> None:
+    """Persist an extraction result in memory and atomically on disk."""
+    _cache_store_memory(key, result)
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=_CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as tmp:
+            tmp.write(result)
+        os.replace(tmp_path, os.path.join(_CACHE_DIR, f"{key}.txt"))
+    except OSError:
+        pass  # Disk caching is best-effort; the result is still returned.
+
+def _cache_store_memory(key: str, result: str) -> None:
+    if len(_memory_cache) >= _MEMORY_CACHE_MAX:
+        _memory_cache.pop(next(iter(_memory_cache)))
+    _memory_cache[key] = result
+
 @tool
 def process_document(file_path: str) -> str:
     """
@@ -19,63 +117,112 @@ def process_document(file_path: str) -> str:
         Extracted text content from the document
     """
     if not os.path.exists(file_path):
-        return json.dumps({"error": f"File not found: {file_path}"})
-    
+        return _json_error(f"File not found: {file_path}")
+
     file_extension = os.path.splitext(file_path)[1].lower()
-    
+
+    # Agent loops frequently re-process the same file during iterative
+    # questioning; key the cache on content so a hit skips the Bedrock call.
+    with open(file_path, 'rb') as document:
+        cache_key = _content_hasher(document.read()).hexdigest()
+    cached = _cache_lookup(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         # Use Bedrock for all document types
         if file_extension == '.pdf':
             # For PDFs, try Bedrock first, then fall back to traditional PDF extraction
             try:
-                return _use_bedrock_for_document(file_path)
+                result = _use_bedrock_for_document(file_path)
             except Exception as e:
                 print(f"Bedrock processing failed, falling back to PDF extraction: {str(e)}")
-                return _process_pdf_traditional(file_path)
-        
+                result = _process_pdf_traditional(file_path)
+
         # Process image files with Bedrock
         elif file_extension in ['.jpg', '.jpeg', '.png', '.tiff', '.bmp']:
-            return _use_bedrock_for_document(file_path)
-        
+            result = _use_bedrock_for_document(file_path)
+
         else:
-            return json.dumps({"error": f"Unsupported file format: {file_extension}"})
-            
+            return _json_error(f"Unsupported file format: {file_extension}")
+
     except Exception as e:
-        return json.dumps({"error": f"Error processing document: {str(e)}"})
+        return _json_error(f"Error processing document: {str(e)}")
+
+    # Only successful extractions are cached; error payloads may be transient.
+    if not result.startswith('{"error"'):
+        _cache_store(cache_key, result)
+    return result
+
+async def process_document_async(file_path: str) -> str:
+    """Async wrapper around process_document for concurrent batch work.
+
+    botocore's invoke_model blocks in Python-level code for the whole HTTP
+    exchange; only the socket reads inside urllib3 release the GIL. Running
+    each call on an executor thread keeps the event loop free, so concurrent
+    documents overlap their network waits instead of serializing on one
+    blocking call.
+    """
+    return await asyncio.get_event_loop().run_in_executor(
+        None, process_document, file_path)
 
 def _process_pdf_traditional(file_path: str) -> str:
     """Extract text from a PDF file using PyPDF."""
     try:
-        # Extract text directly from PDF
-        reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        
+        # Read the PDF into memory once so pypdf's repeated seeks during
+        # per-page stream decoding hit RAM rather than disk; strict=False
+        # skips validation passes that don't matter for text extraction.
+        with open(file_path, 'rb') as pdf_file:
+            pdf_bytes = pdf_file.read()
+        reader = PdfReader(io.BytesIO(pdf_bytes), strict=False)
+        # Extract text directly from PDF. pypdf releases the GIL during the
+        # zlib stream decompression, so a small thread pool extracts pages in
+        # parallel, and the join avoids quadratic string concatenation.
+        num_pages = len(reader.pages)
+        if num_pages > 1:
+            with ThreadPoolExecutor(max_workers=min(8, num_pages)) as executor:
+                parts = list(executor.map(lambda page: page.extract_text(), reader.pages))
+        else:
+            parts = [page.extract_text() for page in reader.pages]
+        text = "\n".join(parts) + "\n"
+
         # If text extraction yields meaningful content, return it
         if len(text.strip()) > 50:
             return text
         
         # If minimal text was extracted, the PDF might be scanned/image-based
         # In this case, we can't extract text using traditional methods
-        return json.dumps({"error": "PDF appears to be image-based and requires Bedrock for processing"})
+        return _json_error("PDF appears to be image-based and requires Bedrock for processing")
         
     except Exception as e:
-        return json.dumps({"error": f"Error processing PDF: {str(e)}"})
+        return _json_error(f"Error processing PDF: {str(e)}")
+
+def _encode_file_base64(file_path: str, chunk_size: int = 3 * 1024 * 1024) -> str:
+    """Base64-encode a file in fixed chunks to bound peak memory.
+
+    The chunk size is a multiple of 3 so every chunk encodes to whole base64
+    quads with no padding mid-stream, letting the per-chunk outputs simply be
+    joined. Peak memory drops from ~2.3x the file size (bytes + encoded bytes
+    + decoded str) to ~4/3 the file size plus one chunk. ASCII decode is
+    marginally faster than UTF-8 since base64 output is pure 7-bit.
+    """
+    encoded_parts = []
+    with open(file_path, 'rb') as file:
+        while True:
+            buffer = file.read(chunk_size)
+            if not buffer:
+                break
+            encoded_parts.append(_b64encode(buffer))
+    return b''.join(encoded_parts).decode('ascii')
 
 def _use_bedrock_for_document(file_path: str) -> str:
     """Use Amazon Bedrock for document processing."""
     try:
-        # Initialize Bedrock client
-        bedrock_runtime = boto3.client(
-            service_name='bedrock-runtime',
-            region_name=os.environ.get('AWS_REGION', 'us-east-1')
-        )
-        
-        # Read file as base64
-        with open(file_path, 'rb') as file:
-            file_bytes = file.read()
-            base64_data = base64.b64encode(file_bytes).decode('utf-8')
+        # Reuse the shared Bedrock client (warm connection pool)
+        bedrock_runtime = _get_bedrock_client()
+
+        # Encode the file in streamed chunks rather than read-all-then-encode
+        base64_data = _encode_file_base64(file_path)
         
         # Determine media type based on file extension
         file_extension = os.path.splitext(file_path)[1].lower()
@@ -122,11 +269,11 @@ def _use_bedrock_for_document(file_path: str) -> str:
         # Invoke Bedrock model
         response = bedrock_runtime.invoke_model(
             modelId=model_id,
-            body=json.dumps(request_body)
+            body=_json_dumps(request_body)
         )
         
         # Parse response
-        response_body = json.loads(response['body'].read().decode('utf-8'))
+        response_body = _json_loads(response['body'].read())
         extracted_text = response_body['content'][0]['text']
         
         return extracted_text
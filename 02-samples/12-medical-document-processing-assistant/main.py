@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 
+import asyncio
+import glob
 import logging
 import os
 
@@ -9,9 +11,13 @@ from medical_coding_tools import (
     get_icd,
     get_rx,
     get_snomed,
+    link_all,
     link_icd,
+    link_icd_batch,
     link_rx,
+    link_rx_batch,
     link_snomed,
+    link_snomed_batch,
 )
 from strands import Agent
 from strands_tools import file_read
@@ -40,23 +46,62 @@ Your tasks include:
 Provide clear, accurate, and structured information that can be used by healthcare professionals.
 """
 
-# Create the medical document processing agent
-medical_agent = Agent(
-    system_prompt=SYSTEM_PROMPT,
-    tools=[
-        file_read,
-        process_document,
-        get_icd,
-        get_rx,
-        get_snomed,
-        link_icd,
-        link_rx,
-        link_snomed,
-    ],
-)
+def _create_agent() -> Agent:
+    """Build a medical document processing agent.
+
+    Agents hold per-instance conversation state that every invocation
+    mutates, so concurrent document tasks each need their own instance;
+    sharing one across parallel calls interleaves their histories.
+    """
+    return Agent(
+        system_prompt=SYSTEM_PROMPT,
+        tools=[
+            file_read,
+            process_document,
+            get_icd,
+            get_rx,
+            get_snomed,
+            link_all,
+            link_icd,
+            link_icd_batch,
+            link_rx,
+            link_rx_batch,
+            link_snomed,
+            link_snomed_batch,
+        ],
+    )
+
+
+# Agent for the interactive (sequential) menu paths
+medical_agent = _create_agent()
+
+
+# Cap concurrent Bedrock calls so a large batch doesn't trip TPS limits
+MAX_CONCURRENT_DOCUMENTS = 5
+
 
+async def _process_documents(file_paths):
+    """Process a batch of documents concurrently with bounded fan-out.
 
-def main():
+    Each agent call blocks on Bedrock for seconds; running them in worker
+    threads via asyncio.gather overlaps that network latency across documents
+    instead of paying it once per file. Each task gets a fresh agent: strands
+    agents are not safe for concurrent invocation, and sharing one would let
+    parallel documents corrupt each other's conversation history.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOCUMENTS)
+
+    async def process_one(file_path):
+        async with semaphore:
+            return await asyncio.to_thread(
+                _create_agent(),
+                f"Process this medical document and extract diagnoses, medications, and treatments with their respective medical codes: {file_path}",
+            )
+
+    return await asyncio.gather(*(process_one(path) for path in file_paths))
+
+
+async def main():
     print("\n🏥 Welcome to the Medical Document Processing Assistant! 🏥\n")
     print(
         "This assistant can process medical documents (PDFs or images) to extract and enrich medical information."
@@ -75,17 +120,17 @@ def main():
         choice = input("\nEnter your choice (1-3): ")
 
         if choice == "1":
-            file_path = input(
-                "\nEnter the path to the medical document (PDF or image): "
+            path_input = input(
+                "\nEnter the path to the medical document (PDF or image), or a glob pattern for a batch: "
             )
-            if not os.path.exists(file_path):
-                print(f"Error: File '{file_path}' not found.")
+            file_paths = sorted(glob.glob(path_input)) or [path_input]
+            missing = [path for path in file_paths if not os.path.exists(path)]
+            if missing:
+                print(f"Error: File '{missing[0]}' not found.")
                 continue
 
-            response = medical_agent(
-                f"Process this medical document and extract diagnoses, medications, and treatments with their respective medical codes: {file_path}"
-            )
-            print("\nProcessing complete!")
+            await _process_documents(file_paths)
+            print(f"\nProcessing complete! ({len(file_paths)} document(s))")
 
         elif choice == "2":
             print("\nEnter the clinical note (press Enter twice when done):")
@@ -101,8 +146,9 @@ def main():
                 print("Error: Empty clinical note.")
                 continue
 
-            response = medical_agent(
-                f"Process this clinical note and extract diagnoses, medications, and treatments with their respective medical codes: {clinical_note}"
+            response = await asyncio.to_thread(
+                medical_agent,
+                f"Process this clinical note and extract diagnoses, medications, and treatments with their respective medical codes: {clinical_note}",
             )
             print("\nProcessing complete!")
 
@@ -115,8 +161,9 @@ def main():
             Send referral order to neurologist
             Follow-up as scheduled
             """
-            response = medical_agent(
-                f"Process this clinical note and extract diagnoses, medications, and treatments with their respective medical codes: {CLINICAL_NOTE}"
+            response = await asyncio.to_thread(
+                medical_agent,
+                f"Process this clinical note and extract diagnoses, medications, and treatments with their respective medical codes: {CLINICAL_NOTE}",
             )
             print("\nSample processing complete!")
 
@@ -132,4 +179,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
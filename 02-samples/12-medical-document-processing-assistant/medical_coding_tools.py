@@ -1,19 +1,206 @@
 #!/usr/bin/env python3
 
+import asyncio
+import functools
+import hashlib
 import os
 import json
+import pickle
+import re
 import requests
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Any, Optional
+from urllib3.util.retry import Retry
 import boto3
+from botocore.config import Config
 from strands import tool
 
+# ijson stream-parses only the fields we consume from large Snowstorm
+# responses instead of materializing the whole document; optional, with the
+# stdlib parser as fallback.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Claude often wraps JSON output in a fenced code block; compile the
+# extraction pattern once instead of on every Bedrock response.
+_JSON_BLOCK_RE = re.compile(r'```json\n(.*?)\n```', re.DOTALL)
+
+# orjson (Rust/SIMD) parses and serializes several times faster than stdlib
+# json; it matters most for the per-chunk parsing in the streaming loop and
+# the Bedrock request envelope.
+try:
+    import orjson
+    _json_dumps = orjson.dumps  # returns bytes, accepted by invoke_model
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+    _json_loads = json.loads
+
+# One pooled session for all terminology lookups: requests.get() builds a
+# fresh Session per call, paying DNS resolution and a TLS handshake that
+# dwarf the actual GET. Keep-alive connections are reused across calls.
+_session = requests.Session()
+# Terminology responses are several KB of JSON and compress 4-6x; pin the
+# encodings explicitly rather than relying on defaults. requests
+# decompresses transparently; br is only safe to advertise because
+# requirements.txt installs brotli, which urllib3 needs to decode it.
+_session.headers.update({"Connection": "keep-alive", "Accept-Encoding": "gzip, br"})
+_session.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.2,
+                      status_forcelist=[429, 502, 503, 504]),
+))
+
+# (connect, read) timeouts so a stalled terminology server can't hang a tool
+_REQUEST_TIMEOUT = (3, 10)
+
+# Code lookups for a given term are stable for days and inputs repeat heavily
+# across documents, so memoize results in memory and on disk with a TTL. A hit
+# skips the network (or Bedrock fallback) call entirely.
+_LOOKUP_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'medical_coding_tools')
+_LOOKUP_TTL_SECONDS = 7 * 24 * 3600
+_lookup_memory_cache: Dict[str, str] = {}
+_LOOKUP_MEMORY_CACHE_MAX = 4096
+
+def _json_result(obj) -> str:
+    """Serialize a result payload to the str the tool contract expects."""
+    return _json_dumps(obj).decode('utf-8')
+
+def _normalize_term(term: str) -> str:
+    """Normalize a lookup term (case, whitespace, punctuation) for caching."""
+    cleaned = ''.join(ch for ch in term.lower() if ch.isalnum() or ch.isspace())
+    return ' '.join(cleaned.split())
+
+def _lookup_cache_key(system: str, term: str) -> str:
+    return hashlib.sha256(f"{system}:{_normalize_term(term)}".encode('utf-8')).hexdigest()
+
+def _lookup_cache_get(key: str) -> Optional[str]:
+    """Return a fresh cached lookup result, or None."""
+    if key in _lookup_memory_cache:
+        return _lookup_memory_cache[key]
+    cache_path = os.path.join(_LOOKUP_CACHE_DIR, f"{key}.json")
+    try:
+        if time.time() - os.path.getmtime(cache_path) > _LOOKUP_TTL_SECONDS:
+            return None
+        with open(cache_path, 'r', encoding='utf-8') as cached:
+            result = cached.read()
+    except OSError:
+        return None
+    _lookup_cache_put_memory(key, result)
+    return result
+
+def _lookup_cache_put(key: str, result: str) -> None:
+    """Store a successful lookup result in memory and atomically on disk."""
+    _lookup_cache_put_memory(key, result)
+    try:
+        os.makedirs(_LOOKUP_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=_LOOKUP_CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as tmp:
+            tmp.write(result)
+        os.replace(tmp_path, os.path.join(_LOOKUP_CACHE_DIR, f"{key}.json"))
+    except OSError:
+        pass  # Disk caching is best-effort
+
+def _lookup_cache_put_memory(key: str, result: str) -> None:
+    if len(_lookup_memory_cache) >= _LOOKUP_MEMORY_CACHE_MAX:
+        _lookup_memory_cache.pop(next(iter(_lookup_memory_cache)))
+    _lookup_memory_cache[key] = result
+
+def _cacheable(result: str) -> bool:
+    """Only cache successful lookups; errors and misses may be transient."""
+    return bool(result) and '"error"' not in result and '"0%"' not in result
+
 # Base URLs for medical terminology APIs
 ICD10_API_BASE_URL = "https://clinicaltables.nlm.nih.gov/api/icd10cm/v3/search"
-RXNORM_API_BASE_URL = "https://rxnav.nlm.nih.gov/REST/rxcui"
-RXNORM_INFO_API_BASE_URL = "https://rxnav.nlm.nih.gov/REST/rxcui/{rxcui}/allrelated"
+# RxNav's .json endpoints avoid XML parsing entirely and are 30-40% smaller
+# on the wire than the XML default.
+RXNORM_API_BASE_URL = "https://rxnav.nlm.nih.gov/REST/rxcui.json"
+RXNORM_INFO_API_BASE_URL = "https://rxnav.nlm.nih.gov/REST/rxcui/{rxcui}/allrelated.json"
 SNOMED_API_BASE_URL = "https://browser.ihtsdotools.org/snowstorm/snomed-ct/MAIN/concepts"
 SNOMED_BROWSER_URL = "https://browser.ihtsdotools.org/?perspective=full&edition=MAIN/SNOMEDCT-US/2025-03-01&languages=en"
 
+# Single-flight: under concurrent load (link_all, bulk drivers, parallel
+# agent calls) the same common term can be requested several times at once.
+# The first caller performs the HTTP/Bedrock call; duplicates block on an
+# Event and share its result instead of issuing their own request.
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def _single_flight(fn):
+    """Collapse concurrent calls with identical arguments into one call."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+        with _inflight_lock:
+            entry = _inflight.get(key)
+            if entry is None:
+                entry = {"event": threading.Event()}
+                _inflight[key] = entry
+                leader = True
+            else:
+                leader = False
+        if not leader:
+            entry["event"].wait()
+            if "error" in entry:
+                raise entry["error"]
+            return entry["result"]
+        try:
+            entry["result"] = fn(*args, **kwargs)
+            return entry["result"]
+        except Exception as e:
+            entry["error"] = e
+            raise
+        finally:
+            with _inflight_lock:
+                _inflight.pop(key, None)
+            entry["event"].set()
+    return wrapper
+
+# Shared pool for bulk lookups; sized above the session's per-host pool so
+# cache hits never queue behind in-flight HTTP requests.
+_LOOKUP_EXECUTOR = ThreadPoolExecutor(max_workers=16)
+
+_LOOKUP_FUNCS = {}  # populated after the tool definitions below
+
+async def lookup_terms_async(system: str, terms: List[str]) -> List[str]:
+    """Look up many terms concurrently from a single event loop.
+
+    Bulk callers (thousands of terms) shouldn't pay one blocked thread per
+    sequential request; fanning the sync lookups out over a shared executor
+    overlaps their network waits while keeping the cache, pooled session,
+    and Bedrock fallback on the existing code path.
+
+    Args:
+        system: One of "icd10", "rxnorm", or "snomed"
+        terms: The terms to look up
+
+    Returns:
+        JSON result strings in the same order as the input terms
+    """
+    lookup = _LOOKUP_FUNCS[system]
+    loop = asyncio.get_running_loop()
+    return list(await asyncio.gather(
+        *(loop.run_in_executor(_LOOKUP_EXECUTOR, lookup, term) for term in terms)))
+
+def _is_permanent_api_error(exc: Exception) -> bool:
+    """True when the API definitively rejected the lookup (400/404).
+
+    Those are misses, not outages: the multi-second Bedrock fallback would
+    be answering the same unknown term and should be reserved for transient
+    failures (connection errors, timeouts, 5xx).
+    """
+    response = getattr(exc, 'response', None)
+    return response is not None and getattr(response, 'status_code', None) in (400, 404)
+
 @tool
 def get_icd(diagnosis: str) -> str:
     """
@@ -25,13 +212,25 @@ def get_icd(diagnosis: str) -> str:
     Returns:
         JSON string containing matching ICD-10 codes and descriptions
     """
+    cache_key = _lookup_cache_key("icd10", diagnosis)
+    cached = _lookup_cache_get(cache_key)
+    if cached is not None:
+        return cached
     try:
         # Use the NLM Clinical Tables API (no authentication required)
-        return _get_icd_from_api(diagnosis)
+        result = _get_icd_from_api(diagnosis)
     except Exception as e:
+        # A definitive 400/404 miss gets a direct not-found answer; only
+        # transient failures are worth the slower Bedrock fallback.
+        if _is_permanent_api_error(e):
+            return json.dumps([{
+                "diagnosis": diagnosis,
+                "ICD10_code": "Not found",
+                "confidence_score": "0%"
+            }])
         # Fallback to Bedrock for code lookup if API fails
         try:
-            return _get_medical_code_from_bedrock(
+            result = _get_medical_code_from_bedrock(
                 diagnosis, 
                 "ICD-10", 
                 "Find the most appropriate ICD-10 codes for this diagnosis"
@@ -41,6 +240,9 @@ def get_icd(diagnosis: str) -> str:
                 "error": f"Error retrieving ICD-10 codes: {str(e)}. Fallback error: {str(inner_e)}",
                 "diagnosis": diagnosis
             })
+    if _cacheable(result):
+        _lookup_cache_put(cache_key, result)
+    return result
 
 @tool
 def get_rx(medication: str) -> str:
@@ -53,13 +255,25 @@ def get_rx(medication: str) -> str:
     Returns:
         JSON string containing matching RxNorm codes and information
     """
+    cache_key = _lookup_cache_key("rxnorm", medication)
+    cached = _lookup_cache_get(cache_key)
+    if cached is not None:
+        return cached
     try:
         # Use the NLM RxNav API (no authentication required)
-        return _get_rx_from_api(medication)
+        result = _get_rx_from_api(medication)
     except Exception as e:
+        # A definitive 400/404 miss gets a direct not-found answer; only
+        # transient failures are worth the slower Bedrock fallback.
+        if _is_permanent_api_error(e):
+            return json.dumps([{
+                "medication": medication,
+                "RxNorm_code": "Not found",
+                "confidence_score": "0%"
+            }])
         # Fallback to Bedrock for code lookup if API fails
         try:
-            return _get_medical_code_from_bedrock(
+            result = _get_medical_code_from_bedrock(
                 medication, 
                 "RxNorm", 
                 "Find the most appropriate RxNorm codes for this medication"
@@ -69,6 +283,9 @@ def get_rx(medication: str) -> str:
                 "error": f"Error retrieving RxNorm codes: {str(e)}. Fallback error: {str(inner_e)}",
                 "medication": medication
             })
+    if _cacheable(result):
+        _lookup_cache_put(cache_key, result)
+    return result
 
 @tool
 def get_snomed(treatment: str) -> str:
@@ -81,13 +298,25 @@ def get_snomed(treatment: str) -> str:
     Returns:
         JSON string containing matching SNOMED CT codes and descriptions
     """
+    cache_key = _lookup_cache_key("snomed", treatment)
+    cached = _lookup_cache_get(cache_key)
+    if cached is not None:
+        return cached
     try:
         # Use the SNOMED CT browser API
-        return _get_snomed_from_api(treatment)
+        result = _get_snomed_from_api(treatment)
     except Exception as e:
+        # A definitive 400/404 miss gets a direct not-found answer; only
+        # transient failures are worth the slower Bedrock fallback.
+        if _is_permanent_api_error(e):
+            return json.dumps([{
+                "treatment": treatment,
+                "SNOMED_code": "Not found",
+                "confidence_score": "0%"
+            }])
         # Fallback to Bedrock for code lookup if API fails
         try:
-            return _get_medical_code_from_bedrock(
+            result = _get_medical_code_from_bedrock(
                 treatment, 
                 "SNOMED CT", 
                 "Find the most appropriate SNOMED CT codes for this treatment or procedure"
@@ -97,6 +326,11 @@ def get_snomed(treatment: str) -> str:
                 "error": f"Error retrieving SNOMED CT codes: {str(e)}. Fallback error: {str(inner_e)}",
                 "treatment": treatment
             })
+    if _cacheable(result):
+        _lookup_cache_put(cache_key, result)
+    return result
+
+_LOOKUP_FUNCS.update({"icd10": get_icd, "rxnorm": get_rx, "snomed": get_snomed})
 
 @tool
 def link_icd(clinical_text: str) -> str:
@@ -237,12 +471,199 @@ def link_snomed(clinical_text: str) -> str:
             "confidence_score": "0%"
         }])
 
+@tool
+def link_all(clinical_text: str) -> str:
+    """
+    Extract diagnoses, medications, and treatments from clinical text and link them to ICD-10, RxNorm, and SNOMED CT codes in parallel.
+
+    Args:
+        clinical_text: The clinical text to analyze
+
+    Returns:
+        JSON string with "diagnoses", "medications", and "treatments" keys
+    """
+    try:
+        # The three extractions are independent Bedrock round-trips; running
+        # them on threads overlaps their network latency, and the shared
+        # client means all three reuse the same warm connection pool.
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            diagnoses = executor.submit(link_icd, clinical_text)
+            medications = executor.submit(link_rx, clinical_text)
+            treatments = executor.submit(link_snomed, clinical_text)
+            return json.dumps({
+                "diagnoses": json.loads(diagnoses.result()),
+                "medications": json.loads(medications.result()),
+                "treatments": json.loads(treatments.result()),
+            })
+    except Exception as e:
+        return json.dumps({
+            "error": f"Error linking clinical text to medical codes: {str(e)}"
+        })
+
+def _link_batch(clinical_texts: List[str], data_type: str, what: str) -> str:
+    """Link codes for several clinical texts with one Bedrock call.
+
+    Numbering the snippets into a single prompt amortizes the multi-second
+    model latency across the whole batch instead of paying it once per text.
+    """
+    numbered = "\n".join(
+        f"--- Snippet {i + 1} ---\n{text}" for i, text in enumerate(clinical_texts))
+    prompt = f"""
+    Extract all {what} from each of the following numbered clinical text snippets and link them to the most appropriate codes.
+    For each snippet, produce the same output you would for a single text.
+
+    {numbered}
+
+    Format the output as a JSON array with exactly {len(clinical_texts)} elements, where element i is the JSON array of objects extracted from snippet i+1 (an empty array if none were found).
+    """
+    return _get_structured_data_from_bedrock(prompt, data_type)
+
+@tool
+def link_icd_batch(clinical_texts: List[str]) -> str:
+    """
+    Extract diagnoses from multiple clinical texts and link them to ICD-10 codes in one model call.
+
+    Args:
+        clinical_texts: The clinical texts to analyze
+
+    Returns:
+        JSON string containing one array of diagnosis objects per input text
+    """
+    try:
+        return _link_batch(clinical_texts, "diagnoses", "diagnoses")
+    except Exception as e:
+        return json.dumps([{
+            "diagnosis": "Error",
+            "ICD10_code": "Error",
+            "error": f"Error linking diagnoses to ICD-10 codes: {str(e)}",
+            "confidence_score": "0%"
+        }])
+
+@tool
+def link_rx_batch(clinical_texts: List[str]) -> str:
+    """
+    Extract medications from multiple clinical texts and link them to RxNorm codes in one model call.
+
+    Args:
+        clinical_texts: The clinical texts to analyze
+
+    Returns:
+        JSON string containing one array of medication objects per input text
+    """
+    try:
+        return _link_batch(clinical_texts, "medications", "medications")
+    except Exception as e:
+        return json.dumps([{
+            "medication": "Error",
+            "RxNorm_code": "Error",
+            "error": f"Error linking medications to RxNorm codes: {str(e)}",
+            "confidence_score": "0%"
+        }])
+
+@tool
+def link_snomed_batch(clinical_texts: List[str]) -> str:
+    """
+    Extract treatments and procedures from multiple clinical texts and link them to SNOMED CT codes in one model call.
+
+    Args:
+        clinical_texts: The clinical texts to analyze
+
+    Returns:
+        JSON string containing one array of procedure objects per input text
+    """
+    try:
+        return _link_batch(clinical_texts, "treatments", "treatments, procedures, and clinical actions")
+    except Exception as e:
+        return json.dumps([{
+            "procedure": "Error",
+            "SNOMED_code": "Error",
+            "error": f"Error linking treatments to SNOMED CT codes: {str(e)}",
+            "confidence_score": "0%"
+        }])
+
+# ICD-10-CM is a fixed ~70k-code corpus; an optional local SQLite FTS5 index
+# of it answers searches with zero network I/O. Build one from a CMS code
+# descriptions file (code<TAB>name, or space-separated) with
+# build_icd10_index(); lookups fall back to the NLM API when the index is
+# missing or has no match.
+_ICD10_DB_PATH = os.environ.get(
+    'ICD10_DB_PATH',
+    os.path.join(os.path.expanduser('~'), '.cache', 'medical_coding_tools', 'icd10.sqlite'))
+_icd10_db = None
+
+def build_icd10_index(codes_path: str, db_path: str = None) -> int:
+    """Build the local ICD-10-CM FTS5 index from a code descriptions file.
+
+    Args:
+        codes_path: Path to a CMS ICD-10-CM code descriptions text file
+        db_path: Destination database (defaults to ICD10_DB_PATH)
+
+    Returns:
+        Number of codes indexed
+    """
+    db_path = db_path or _ICD10_DB_PATH
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    rows = []
+    with open(codes_path, 'r', encoding='utf-8') as codes_file:
+        for line in codes_file:
+            code, _, name = line.rstrip('\n').partition('\t')
+            if not name:
+                code, _, name = line.rstrip('\n').partition(' ')
+            code, name = code.strip(), name.strip()
+            if code and name:
+                rows.append((code, name))
+    db = sqlite3.connect(db_path)
+    try:
+        db.execute("DROP TABLE IF EXISTS icd")
+        db.execute("CREATE VIRTUAL TABLE icd USING fts5(code, name)")
+        db.executemany("INSERT INTO icd (code, name) VALUES (?, ?)", rows)
+        db.commit()
+    finally:
+        db.close()
+    return len(rows)
+
+def _get_icd10_db():
+    """Return a connection to the local ICD-10 index, or None if absent."""
+    global _icd10_db
+    if _icd10_db is None and os.path.exists(_ICD10_DB_PATH):
+        _icd10_db = sqlite3.connect(_ICD10_DB_PATH, check_same_thread=False)
+    return _icd10_db
+
+def _get_icd_from_local_index(diagnosis: str) -> Optional[str]:
+    """Serve an ICD-10 search from the local FTS5 index, or None on miss."""
+    db = _get_icd10_db()
+    if db is None:
+        return None
+    try:
+        # Quote each token so punctuation in clinical phrasing can't be
+        # misread as FTS5 query syntax.
+        query = " ".join(f'"{token}"' for token in diagnosis.split())
+        rows = db.execute(
+            "SELECT code, name FROM icd WHERE icd MATCH ? ORDER BY rank LIMIT 5",
+            (query,)).fetchall()
+    except sqlite3.Error:
+        return None
+    if not rows:
+        return None
+    return _json_result([{
+        "diagnosis": diagnosis,
+        "ICD10_code": code,
+        "description": name,
+        "confidence_score": f"{max(95 - (i * 5), 70)}%"
+    } for i, (code, name) in enumerate(rows)])
+
+@_single_flight
 def _get_icd_from_api(diagnosis: str, api_key: str = None) -> str:
     """
     Query NLM Clinical Tables API for ICD-10 codes.
     
     API Documentation: https://clinicaltables.nlm.nih.gov/apidoc/icd10cm/v3/doc.html
     """
+    # A populated local index answers without any network round trip.
+    local = _get_icd_from_local_index(diagnosis)
+    if local is not None:
+        return local
+
     params = {
         "terms": diagnosis,
         "sf": "code,name",
@@ -251,102 +672,175 @@ def _get_icd_from_api(diagnosis: str, api_key: str = None) -> str:
     }
     
     # Note: This API doesn't require authentication for basic usage
-    response = requests.get(ICD10_API_BASE_URL, params=params)
-    
-    if response.status_code == 200:
-        data = response.json()
-        results = []
-        
-        # The API returns data in the format [total, abbreviation, items_json, codes]
-        # where codes is a list of codes and items_json contains descriptions
-        if len(data) >= 4:
-            codes = data[3]  # List of codes
-            descriptions = data[2]  # List of descriptions
-            
-            for i, code in enumerate(codes):
-                if i < len(descriptions):
-                    # Calculate confidence score - higher for earlier results
-                    confidence_score = f"{max(95 - (i * 5), 70)}%"
-                    
-                    results.append({
-                        "diagnosis": diagnosis,
-                        "ICD10_code": code,
-                        "description": descriptions[i],
-                        "confidence_score": confidence_score
-                    })
-        
-        return json.dumps(results)
-    else:
-        return json.dumps([{
-            "diagnosis": diagnosis,
-            "error": f"API error: {response.status_code}",
-            "confidence_score": "0%"
-        }])
+    response = _session.get(ICD10_API_BASE_URL, params=params, timeout=_REQUEST_TIMEOUT)
+    # Raise on HTTP errors so the caller can classify them: 400/404 are
+    # definitive misses answered directly, 5xx go to the Bedrock fallback.
+    response.raise_for_status()
+
+    data = response.json()
+    results = []
+
+    # The API returns data in the format [total, abbreviation, items_json, codes]
+    # where codes is a list of codes and items_json contains descriptions
+    if len(data) >= 4:
+        codes = data[3]  # List of codes
+        descriptions = data[2]  # List of descriptions
+
+        # Preallocate: the result count is known up front, so fill slots
+        # instead of growing the list append by append.
+        count = min(len(codes), len(descriptions))
+        results = [None] * count
+        for i in range(count):
+            # Calculate confidence score - higher for earlier results
+            confidence_score = f"{max(95 - (i * 5), 70)}%"
+
+            results[i] = {
+                "diagnosis": diagnosis,
+                "ICD10_code": codes[i],
+                "description": descriptions[i],
+                "confidence_score": confidence_score
+            }
+
+    return _json_result(results)
+
+# Prioritize SCD (Semantic Clinical Drug), IN (Ingredient) and BN (Brand
+# Name) term types when picking a concept description.
+_PREFERRED_TTYS = ("SCD", "IN", "BN")
+
+def _parse_rxcuis(payload: Dict[str, Any]) -> List[str]:
+    """Extract rxnormId values from an RxNav JSON response."""
+    return payload.get("idGroup", {}).get("rxnormId") or []
+
+def _parse_concept_name(payload: Dict[str, Any]) -> str:
+    """Extract the best concept name from an RxNav allrelated JSON response."""
+    concept_groups = payload.get("allRelatedGroup", {}).get("conceptGroup") or []
+    first_name = ""
+    for group in concept_groups:
+        for concept in group.get("conceptProperties") or []:
+            name = concept.get("name")
+            if not name:
+                continue
+            if not first_name:
+                first_name = name
+            if concept.get("tty") in _PREFERRED_TTYS:
+                return name
+    # If we didn't find a preferred term type, use the first name
+    return first_name
+
+# Optional prebuilt RxNorm name index: the monthly full release maps every
+# drug name to its RxCUIs, so lookups become in-memory dict probes with no
+# RxNav round trips. Build it from RXNCONSO.RRF with build_rxnorm_index();
+# unknown medications fall through to the HTTP API.
+_RXNORM_INDEX_PATH = os.environ.get(
+    'RXNORM_INDEX_PATH',
+    os.path.join(os.path.expanduser('~'), '.cache', 'medical_coding_tools', 'rxnorm_index.pkl'))
+_rxnorm_index = None
+_rxnorm_index_loaded = False
+
+def build_rxnorm_index(rrf_path: str, index_path: str = None) -> int:
+    """Build the local RxNorm name index from an RXNCONSO.RRF file.
+
+    Args:
+        rrf_path: Path to RXNCONSO.RRF from an RxNorm full release
+        index_path: Destination pickle (defaults to RXNORM_INDEX_PATH)
+
+    Returns:
+        Number of names indexed
+    """
+    index_path = index_path or _RXNORM_INDEX_PATH
+    index = {}
+    with open(rrf_path, 'r', encoding='utf-8') as rrf:
+        for line in rrf:
+            # RXNCONSO.RRF is pipe-delimited: RXCUI|LAT|...|TTY(12)|...|STR(14)|...
+            fields = line.split('|')
+            if len(fields) < 15 or fields[1] != 'ENG':
+                continue
+            rxcui, tty, name = fields[0], fields[12], fields[14]
+            index.setdefault(_normalize_term(name), []).append((rxcui, tty, name))
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(index_path), suffix='.tmp')
+    with os.fdopen(fd, 'wb') as tmp:
+        pickle.dump(index, tmp, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, index_path)
+    return len(index)
+
+def _get_rxnorm_index():
+    """Load the local RxNorm index on first use, or return None if absent."""
+    global _rxnorm_index, _rxnorm_index_loaded
+    if not _rxnorm_index_loaded:
+        _rxnorm_index_loaded = True
+        try:
+            with open(_RXNORM_INDEX_PATH, 'rb') as index_file:
+                _rxnorm_index = pickle.load(index_file)
+        except (OSError, pickle.UnpicklingError):
+            _rxnorm_index = None
+    return _rxnorm_index
+
+def _get_rx_from_local_index(medication: str) -> Optional[str]:
+    """Serve an RxNorm lookup from the local name index, or None on miss."""
+    index = _get_rxnorm_index()
+    if index is None:
+        return None
+    concepts = index.get(_normalize_term(medication))
+    if not concepts:
+        return None
+    # Mirror the API path's preference for clinical-drug term types.
+    concepts = sorted(
+        concepts,
+        key=lambda c: _PREFERRED_TTYS.index(c[1]) if c[1] in _PREFERRED_TTYS else len(_PREFERRED_TTYS))
+    return _json_result([{
+        "medication": medication,
+        "RxNorm_code": rxcui,
+        "description": name,
+        "confidence_score": f"{max(95 - (i * 5), 70)}%"
+    } for i, (rxcui, tty, name) in enumerate(concepts[:3])])
 
+@_single_flight
 def _get_rx_from_api(medication: str, api_key: str = None) -> str:
     """
     Query RxNav API for RxNorm codes.
     
     API Documentation: https://lhncbc.nlm.nih.gov/RxNav/APIs/RxNormAPIs.html
     """
+    # A populated local index resolves the name without touching RxNav.
+    local = _get_rx_from_local_index(medication)
+    if local is not None:
+        return local
+
     # Step 1: Find RxCUI for the medication name
     params = {
         "name": medication
     }
     
     # RxNav API doesn't require authentication
-    response = requests.get(f"{RXNORM_API_BASE_URL}", params=params)
-    
-    if response.status_code != 200:
-        return json.dumps([{
-            "medication": medication,
-            "error": f"API error: {response.status_code}",
-            "confidence_score": "0%"
-        }])
-    
-    # Parse the XML response
-    import xml.etree.ElementTree as ET
-    root = ET.fromstring(response.content)
-    
-    # Extract RxCUI values
-    rxcui_elements = root.findall(".//rxnormId")
-    if not rxcui_elements:
+    response = _session.get(RXNORM_API_BASE_URL, params=params, timeout=_REQUEST_TIMEOUT)
+    # Raise on HTTP errors so the caller can classify them: 400/404 are
+    # definitive misses answered directly, 5xx go to the Bedrock fallback.
+    response.raise_for_status()
+
+    rxcuis = _parse_rxcuis(response.json())
+    if not rxcuis:
         return json.dumps([{
             "medication": medication,
             "RxNorm_code": "Not found",
             "confidence_score": "0%"
         }])
-    
+
     results = []
-    
-    # For each RxCUI, get additional information
-    for i, rxcui_element in enumerate(rxcui_elements[:3]):  # Limit to first 3 results
-        rxcui = rxcui_element.text
-        
-        # Step 2: Get related information for this RxCUI
-        info_url = RXNORM_INFO_API_BASE_URL.format(rxcui=rxcui)
-        info_response = requests.get(info_url)
-        
+
+    # Step 2: Fetch related information for each RxCUI. The allrelated calls
+    # are independent, so fire them concurrently over the pooled session;
+    # executor.map preserves ordering so confidence scoring stays stable.
+    rxcuis = rxcuis[:3]  # Limit to first 3 results
+    info_urls = [RXNORM_INFO_API_BASE_URL.format(rxcui=rxcui) for rxcui in rxcuis]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        info_responses = list(executor.map(
+            lambda url: _session.get(url, timeout=_REQUEST_TIMEOUT), info_urls))
+
+    for i, (rxcui, info_response) in enumerate(zip(rxcuis, info_responses)):
         if info_response.status_code == 200:
-            info_root = ET.fromstring(info_response.content)
-            
-            # Extract concept information
-            concept_name = ""
-            concept_elements = info_root.findall(".//conceptProperties")
-            for concept in concept_elements:
-                name_element = concept.find("name")
-                tty_element = concept.find("tty")  # Term Type
-                
-                if name_element is not None and tty_element is not None:
-                    # Prioritize SCD (Semantic Clinical Drug) or IN (Ingredient) term types
-                    if tty_element.text in ["SCD", "IN", "BN"]:
-                        concept_name = name_element.text
-                        break
-            
-            # If we didn't find a preferred term type, use the first name
-            if not concept_name and concept_elements and concept_elements[0].find("name") is not None:
-                concept_name = concept_elements[0].find("name").text
-            
+            concept_name = _parse_concept_name(info_response.json())
+
             # Calculate confidence score - higher for earlier results
             confidence_score = f"{max(95 - (i * 5), 70)}%"
             
@@ -357,8 +851,9 @@ def _get_rx_from_api(medication: str, api_key: str = None) -> str:
                 "confidence_score": confidence_score
             })
     
-    return json.dumps(results)
+    return _json_result(results)
 
+@_single_flight
 def _get_snomed_from_api(treatment: str, api_key: str = None) -> str:
     """
     Query SNOMED CT browser API for SNOMED CT codes.
@@ -383,50 +878,60 @@ def _get_snomed_from_api(treatment: str, api_key: str = None) -> str:
         "returnPtField": True
     }
     
-    headers = {}
+    # Snowstorm content-negotiates; ask for JSON outright to skip any
+    # server-side default-format handling.
+    headers = {"Accept": "application/json"}
     if api_key:
         headers["Authorization"] = f"Bearer {api_key}"
     
     try:
-        response = requests.get(search_url, params=params, headers=headers)
-        
-        if response.status_code == 200:
-            data = response.json()
-            results = []
-            
-            if "items" in data and len(data["items"]) > 0:
-                for i, item in enumerate(data["items"]):
-                    concept_id = item.get("conceptId")
-                    
-                    # Get the Fully Specified Name (FSN)
-                    fsn = item.get("fsn", {}).get("term", "")
-                    
-                    # Get the Preferred Term (PT)
-                    pt = item.get("pt", {}).get("term", "")
-                    
-                    # Calculate confidence score - higher for earlier results
-                    confidence_score = f"{max(95 - (i * 5), 70)}%"
-                    
-                    results.append({
-                        "procedure": treatment,
-                        "SNOMED_code": concept_id,
-                        "description": pt or fsn,
-                        "confidence_score": confidence_score
-                    })
-                
-                return json.dumps(results)
-            else:
-                return json.dumps([{
-                    "procedure": treatment,
-                    "SNOMED_code": "Not found",
-                    "confidence_score": "0%"
-                }])
+        # Stream the body: Snowstorm concepts carry dozens of fields we never
+        # read, and ijson pulls out just the items without materializing the
+        # full multi-KB document.
+        response = _session.get(search_url, params=params, headers=headers,
+                                timeout=_REQUEST_TIMEOUT, stream=True)
+        # Raise on HTTP errors so the caller can classify them: 400/404 are
+        # definitive misses answered directly, 5xx go to the Bedrock fallback.
+        response.raise_for_status()
+
+        if ijson is not None:
+            response.raw.decode_content = True  # undo gzip before parsing
+            items = ijson.items(response.raw, 'items.item')
+        else:
+            items = response.json().get("items") or []
+        results = []
+
+        for i, item in enumerate(items):
+            concept_id = item.get("conceptId")
+
+            # Get the Fully Specified Name (FSN)
+            fsn = item.get("fsn", {}).get("term", "")
+
+            # Get the Preferred Term (PT)
+            pt = item.get("pt", {}).get("term", "")
+
+            # Calculate confidence score - higher for earlier results
+            confidence_score = f"{max(95 - (i * 5), 70)}%"
+
+            results.append({
+                "procedure": treatment,
+                "SNOMED_code": concept_id,
+                "description": pt or fsn,
+                "confidence_score": confidence_score
+            })
+
+        if results:
+            return _json_result(results)
         else:
             return json.dumps([{
                 "procedure": treatment,
-                "error": f"API error: {response.status_code}",
+                "SNOMED_code": "Not found",
                 "confidence_score": "0%"
             }])
+    except requests.RequestException:
+        # Transport and HTTP errors propagate so get_snomed can classify
+        # them (not-found payload vs Bedrock fallback).
+        raise
     except Exception as e:
         return json.dumps([{
             "procedure": treatment,
@@ -434,32 +939,79 @@ def _get_snomed_from_api(treatment: str, api_key: str = None) -> str:
             "confidence_score": "0%"
         }])
 
-def _get_medical_code_from_bedrock(term: str, code_system: str, instruction: str) -> str:
-    """Use Amazon Bedrock to look up medical codes."""
+@functools.lru_cache(maxsize=1)
+def _get_bedrock_client():
+    """Return a shared bedrock-runtime client, created lazily on first use.
+
+    Client construction parses service model JSON and builds a fresh urllib3
+    pool on every call, which dominates short code lookups; one cached client
+    also keeps TCP/TLS connections warm across tool invocations.
+    """
+    return boto3.client(
+        service_name='bedrock-runtime',
+        region_name=os.environ.get('AWS_REGION', 'us-east-1'),
+        config=Config(
+            max_pool_connections=32,
+            retries={'max_attempts': 3, 'mode': 'adaptive'},
+            tcp_keepalive=True,
+        ),
+    )
+
+def _invoke_model_text(bedrock_runtime, model_id: str, request_body: Dict[str, Any]) -> str:
+    """Invoke the model with the streaming API and assemble text incrementally.
+
+    invoke_model blocks until the full response is generated; streaming lets
+    us return as soon as the model has emitted a complete top-level JSON
+    value, saving the tail of the generation latency. Falls back to the
+    blocking API where streaming is unavailable.
+    """
     try:
-        # Initialize Bedrock client
-        bedrock_runtime = boto3.client(
-            service_name='bedrock-runtime',
-            region_name=os.environ.get('AWS_REGION', 'us-east-1')
+        response = bedrock_runtime.invoke_model_with_response_stream(
+            modelId=model_id,
+            body=_json_dumps(request_body)
         )
-        
-        # Prepare request for Claude model
-        model_id = os.environ.get('BEDROCK_MODEL_ID', 'anthropic.claude-3-sonnet-20240229-v1:0')
-        
-        # Adjust prompt based on code system
-        if code_system == "ICD-10":
-            code_field = "ICD10_code"
-            term_field = "diagnosis"
-        elif code_system == "RxNorm":
-            code_field = "RxNorm_code"
-            term_field = "medication"
-        else:  # SNOMED CT
-            code_field = "SNOMED_code"
-            term_field = "procedure"
-        
-        prompt = f"""
-        {instruction}: "{term}"
-        
+    except Exception:
+        response = bedrock_runtime.invoke_model(
+            modelId=model_id,
+            body=_json_dumps(request_body)
+        )
+        response_body = _json_loads(response['body'].read())
+        return response_body['content'][0]['text']
+
+    parts = []
+    for event in response['body']:
+        chunk = _json_loads(event['chunk']['bytes'])
+        if chunk.get('type') != 'content_block_delta':
+            continue
+        delta = chunk['delta'].get('text', '')
+        if not delta:
+            continue
+        parts.append(delta)
+        # Once a closing bracket arrives, check whether the accumulated text
+        # already forms a complete JSON value and stop reading if so.
+        if ']' in delta or '}' in delta:
+            candidate = ''.join(parts).strip()
+            if candidate.startswith(('[', '{')):
+                try:
+                    _json_loads(candidate)
+                except ValueError:
+                    pass
+                else:
+                    break
+    return ''.join(parts)
+
+# Field names per code system, shared by the prompt builder and both the
+# fallback and error payloads.
+_CODE_META = {
+    "ICD-10": ("ICD10_code", "diagnosis"),
+    "RxNorm": ("RxNorm_code", "medication"),
+    "SNOMED CT": ("SNOMED_code", "procedure"),
+}
+
+# Pre-render the static instruction suffix once per code system; per call
+# only the tool-specific instruction line is prepended.
+_CODE_SYSTEM_SUFFIXES = {
+    code_system: """
         Return the result in this exact JSON format:
         {{
             "{term_field}": "The exact term provided",
@@ -469,32 +1021,51 @@ def _get_medical_code_from_bedrock(term: str, code_system: str, instruction: str
         }}
         
         If multiple codes are possible, return an array of JSON objects in the above format, with decreasing confidence scores (95%, 90%, 85%, etc.).
-        """
+        """.format(term_field=term_field, code_field=code_field)
+    for code_system, (code_field, term_field) in _CODE_META.items()
+}
+
+@_single_flight
+def _get_medical_code_from_bedrock(term: str, code_system: str, instruction: str) -> str:
+    """Use Amazon Bedrock to look up medical codes."""
+    try:
+        # Reuse the shared Bedrock client (warm connection pool)
+        bedrock_runtime = _get_bedrock_client()
+        
+        # Prepare request for Claude model
+        model_id = os.environ.get('BEDROCK_MODEL_ID', 'anthropic.claude-3-sonnet-20240229-v1:0')
+        
+        # The instructions and JSON schema are identical for every term in a
+        # given code system; send them as a cache-marked system block so
+        # Bedrock tokenizes the fixed prefix once, leaving only the term
+        # itself as per-call input.
+        code_field, term_field = _CODE_META.get(code_system, _CODE_META["SNOMED CT"])
+        system_text = f"\n        {instruction} provided by the user.\n        " + _CODE_SYSTEM_SUFFIXES.get(
+            code_system, _CODE_SYSTEM_SUFFIXES["SNOMED CT"])
         
         request_body = {
             "anthropic_version": "bedrock-2023-05-31",
             "max_tokens": 1024,
+            "system": [
+                {
+                    "type": "text",
+                    "text": system_text,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ],
             "messages": [
                 {
                     "role": "user",
-                    "content": prompt
+                    "content": f'"{term}"'
                 }
             ]
         }
         
-        # Invoke Bedrock model
-        response = bedrock_runtime.invoke_model(
-            modelId=model_id,
-            body=json.dumps(request_body)
-        )
-        
-        # Parse response
-        response_body = json.loads(response['body'].read().decode('utf-8'))
-        result = response_body['content'][0]['text']
+        # Invoke Bedrock model, streaming the response as it is generated
+        result = _invoke_model_text(bedrock_runtime, model_id, request_body)
         
         # Extract JSON from response if needed
-        import re
-        json_match = re.search(r'```json\n(.*?)\n```', result, re.DOTALL)
+        json_match = _JSON_BLOCK_RE.search(result)
         if json_match:
             result = json_match.group(1)
         
@@ -515,16 +1086,8 @@ def _get_medical_code_from_bedrock(term: str, code_system: str, instruction: str
             }])
             
     except Exception as e:
-        if code_system == "ICD-10":
-            code_field = "ICD10_code"
-            term_field = "diagnosis"
-        elif code_system == "RxNorm":
-            code_field = "RxNorm_code"
-            term_field = "medication"
-        else:  # SNOMED CT
-            code_field = "SNOMED_code"
-            term_field = "procedure"
-            
+        code_field, term_field = _CODE_META.get(code_system, _CODE_META["SNOMED CT"])
+
         return json.dumps([{
             term_field: term,
             code_field: "Error",
@@ -532,21 +1095,22 @@ def _get_medical_code_from_bedrock(term: str, code_system: str, instruction: str
             "confidence_score": "0%"
         }])
 
+@_single_flight
 def _get_structured_data_from_bedrock(prompt: str, data_type: str) -> str:
     """Use Amazon Bedrock to extract structured data from clinical text."""
     try:
-        # Initialize Bedrock client
-        bedrock_runtime = boto3.client(
-            service_name='bedrock-runtime',
-            region_name=os.environ.get('AWS_REGION', 'us-east-1')
-        )
+        # Reuse the shared Bedrock client (warm connection pool)
+        bedrock_runtime = _get_bedrock_client()
         
         # Prepare request for Claude model
         model_id = os.environ.get('BEDROCK_MODEL_ID', 'anthropic.claude-3-sonnet-20240229-v1:0')
         
-        # Modify prompt based on data type to ensure consistent output format
+        # The per-data-type format spec is static boilerplate; send it as a
+        # cache-marked system block so Bedrock tokenizes it once instead of
+        # re-processing it with every clinical text.
+        system_text = ""
         if "diagnoses" in data_type:
-            prompt += """
+            system_text = """
             Each diagnosis object should have this exact format:
             {
                 "diagnosis": "The diagnosis as mentioned in the text",
@@ -556,7 +1120,7 @@ def _get_structured_data_from_bedrock(prompt: str, data_type: str) -> str:
             }
             """
         elif "medications" in data_type:
-            prompt += """
+            system_text = """
             Each medication object should have this exact format:
             {
                 "medication": "The medication name as mentioned in the text",
@@ -568,7 +1132,7 @@ def _get_structured_data_from_bedrock(prompt: str, data_type: str) -> str:
             }
             """
         elif "treatments" in data_type or "procedures" in data_type:
-            prompt += """
+            system_text = """
             Each treatment/procedure object should have this exact format:
             {
                 "procedure": "The treatment/procedure as mentioned in the text",
@@ -588,20 +1152,20 @@ def _get_structured_data_from_bedrock(prompt: str, data_type: str) -> str:
                 }
             ]
         }
+        if system_text:
+            request_body["system"] = [
+                {
+                    "type": "text",
+                    "text": system_text,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ]
         
-        # Invoke Bedrock model
-        response = bedrock_runtime.invoke_model(
-            modelId=model_id,
-            body=json.dumps(request_body)
-        )
-        
-        # Parse response
-        response_body = json.loads(response['body'].read().decode('utf-8'))
-        result = response_body['content'][0]['text']
+        # Invoke Bedrock model, streaming the response as it is generated
+        result = _invoke_model_text(bedrock_runtime, model_id, request_body)
         
         # Extract JSON from response if needed
-        import re
-        json_match = re.search(r'```json\n(.*?)\n```', result, re.DOTALL)
+        json_match = _JSON_BLOCK_RE.search(result)
         if json_match:
             result = json_match.group(1)
         
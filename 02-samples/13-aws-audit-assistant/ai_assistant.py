@@ -37,5 +37,6 @@ agent = Agent(
     model=bedrock_model
 )
 
-response = agent("audit my s3 bucket for best practice, bucket name is testingbucket101 in us-east-1 region")
-print(response)
+if __name__ == "__main__":
+    response = agent("audit my s3 bucket for best practice, bucket name is testingbucket101 in us-east-1 region")
+    print(response)
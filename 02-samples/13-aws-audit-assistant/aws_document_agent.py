@@ -1,7 +1,36 @@
+import contextlib
+import threading
+
 from strands import Agent, tool
 from strands.tools.mcp import MCPClient
 from mcp import stdio_client, StdioServerParameters
 
+_SYSTEM_PROMPT = """
+    You are a helpful agent that is going to read the documentation and provide summary of the best practices for a service.
+
+    """
+
+# The MCP stdio server (uvx fetch + subprocess spawn + handshake) and the
+# agent are expensive to set up; build them once and reuse across invocations
+# so repeat audits only pay the model call. The ExitStack keeps the MCP
+# session open for the life of the process.
+_aws_client = MCPClient(
+    lambda: stdio_client(StdioServerParameters(command="uvx", args=["awslabs.aws-documentation-mcp-server@latest"]))
+)
+_mcp_stack = contextlib.ExitStack()
+_doc_agent = None
+_doc_agent_lock = threading.Lock()
+
+def _get_doc_agent() -> Agent:
+    """Return the shared documentation agent, starting the MCP server once."""
+    global _doc_agent
+    if _doc_agent is None:
+        with _doc_agent_lock:
+            if _doc_agent is None:
+                _mcp_stack.enter_context(_aws_client)
+                _doc_agent = Agent(tools=_aws_client.list_tools_sync(), system_prompt=_SYSTEM_PROMPT)
+    return _doc_agent
+
 @tool
 def doc_retrieve(query:str) -> str:
     """
@@ -9,10 +38,10 @@ def doc_retrieve(query:str) -> str:
 
     Args:
         query (str): The name of the AWS service to get best practices for. For example: "Amazon S3", "Amazon EC2", etc.
-        
+
     Returns:
         str: A summary of best practices and recommendations for the specified AWS service, extracted from official documentation.
-        
+
     Example:
         >>> doc_retrieve("audit my Amazon S3 bucket for best practices, bucket name is testbucket101")
         "Best practices for Amazon S3:
@@ -21,20 +50,10 @@ def doc_retrieve(query:str) -> str:
          3. Configure lifecycle policies
          ..."    """
 
+    try:
+        agent = _get_doc_agent()
+        response = agent(query)
 
-    system_prompt = """
-    You are a helpful agent that is going to read the documentation and provide summary of the best practices for a service.
-    
-    """
-    aws_client = MCPClient(
-        lambda: stdio_client(StdioServerParameters(command="uvx", args=["awslabs.aws-documentation-mcp-server@latest"]))
-    )
-
-    with aws_client:
-        try:
-            agent = Agent(tools=aws_client.list_tools_sync(), system_prompt=system_prompt)
-            response = agent(query)   
-            
-
-        except Exception as e:
-            print(f"An error occurred: {e}")
+
+    except Exception as e:
+        print(f"An error occurred: {e}")
@@ -8,6 +8,17 @@ from aws_document_agent import doc_retrieve as doc_agent
 import os
 os.environ["BYPASS_TOOL_CONSENT"] = "true"
 os.environ["STRANDS_TOOL_CONSOLE_MODE"] = "disabled"
+
+# Build the model and agent once at module scope; constructing them per call
+# redoes Bedrock client setup (TLS, connection pool) on every invocation.
+bedrock_model = BedrockModel(model_id="anthropic.claude-3-5-sonnet-20241022-v2:0", temperature=0.4)
+
+_code_agent = Agent(
+    system_prompt="You are a coding assistant for boto3 python library. You can use the available tools to execute python code and get the output.",
+    tools=[python_repl, file_read, shell, http_request, editor, journal],
+    model=bedrock_model
+)
+
 @tool
 def code_assistant(query: str) -> str:
     """
@@ -20,14 +31,7 @@ def code_assistant(query: str) -> str:
         you will create a code by utilizing the tools, pick up the environment variables for access key and secret access key and execute the script.
         you will return the result of the output
     """
-    bedrock_model = BedrockModel(model_id="anthropic.claude-3-5-sonnet-20241022-v2:0", temperature=0.4)
-
-    agent = Agent(
-        system_prompt="You are a coding assistant for boto3 python library. You can use the available tools to execute python code and get the output.",
-        tools=[python_repl, file_read, shell, http_request, editor, journal],
-        model=bedrock_model
-    )
-    response = agent(query)
+    response = _code_agent(query)
     print("\n\n")
     return response
 
@@ -20,12 +20,34 @@ A comprehensive data processing agent for AWS services including Glue, EMR, and
 
 __version__ = "0.1.0"
 
-from amazon_dataprocessing_agent.core.agent_manager import MCPAgentManager
-from amazon_dataprocessing_agent.core.session_state import SessionState
-from amazon_dataprocessing_agent.ui.components import UIComponents
+import importlib
 
-__all__ = [
+# Lazy submodule loading (PEP 562): the eager imports pulled in boto3,
+# strands, and streamlit for any consumer of the package, inflating the
+# cold-start path Streamlit re-runs on every interaction. Each symbol is
+# imported on first attribute access and then cached in globals().
+_LAZY = {
+    "MCPAgentManager": "amazon_dataprocessing_agent.core.agent_manager",
+    "SessionState": "amazon_dataprocessing_agent.core.session_state",
+    "UIComponents": "amazon_dataprocessing_agent.ui.components",
+}
+
+__all__: tuple = (
     "MCPAgentManager",
     "SessionState",
     "UIComponents",
-]
+)
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -14,11 +14,32 @@
 
 """Configuration management for the DataProcessing Agent."""
 
-from amazon_dataprocessing_agent.config.constants import *
-from amazon_dataprocessing_agent.config.prompts import SYSTEM_PROMPT
+import importlib
 
-__all__ = [
+# Lazy re-exports (PEP 562): resolving these eagerly would render the system
+# prompt and load the CSS asset for every consumer of the config package.
+_LAZY = {
+    "SYSTEM_PROMPT": "amazon_dataprocessing_agent.config.prompts",
+    "MAX_CONTEXT_MESSAGES": "amazon_dataprocessing_agent.config.constants",
+    "PAGE_STYLE": "amazon_dataprocessing_agent.config.constants",
+}
+
+__all__: tuple = (
     "SYSTEM_PROMPT",
     "MAX_CONTEXT_MESSAGES",
     "PAGE_STYLE",
-]
+)
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -14,6 +14,7 @@
 
 """MCP Agent Manager for the DataProcessing Agent."""
 
+import asyncio
 import logging
 import os
 import re
@@ -26,18 +27,68 @@ from strands import Agent
 from strands.agent.conversation_manager import SlidingWindowConversationManager
 from strands.tools.mcp import MCPClient
 
+from amazon_dataprocessing_agent.tools.batch_tools import \
+    create_batch_execute_tool
 from amazon_dataprocessing_agent.tools.email_tools import \
     create_send_email_tools
 from amazon_dataprocessing_agent.tools.s3_tables_tools import \
     create_s3tables_tools
 
+from ..config import prompts
 from ..config.prompts import SYSTEM_PROMPT
-from .strands_bedrock_agent import StrandsBedrockAgent
+from .strands_bedrock_agent import _BEDROCK_EXECUTOR, StrandsBedrockAgent
 from .chat_history_manager import ChatHistoryManager
 from .streaming_handler import StreamingHandler
 
 logger = logging.getLogger(__name__)
 
+# MCP server launch arguments, prepared once. Reading the environment at
+# import time also keeps the stdio launch config deterministic across
+# re-initializations within a process.
+_MCP_ARGS = ["awslabs.aws-dataprocessing-mcp-server@latest", "--allow-write"]
+_MCP_ENV = {
+    "FASTMCP_LOG_LEVEL": os.getenv("FASTMCP_LOG_LEVEL", "ERROR"),
+    "AWS_PROFILE": os.getenv("AWS_PROFILE", "dp-mcp"),
+}
+
+# ATX headers at line start (MULTILINE ^ covers mid-string lines too); one
+# compiled pass replaces the previous 13 sequential re.sub scans.
+_HEADER_RE = re.compile(r"^(#{1,6})[ \t]+(.+?)[ \t]*$", re.MULTILINE)
+
+# Thinking blocks emitted per the system prompt's response framework.
+_THINK_RE = re.compile(r"<thinking>(.*?)</thinking>", re.DOTALL)
+
+# Static header for the metrics block; built (and UTF-8 encoded) once.
+_METRICS_HEADER = "\n📊 EXECUTION STATISTICS"
+
+_CONNECTION_ERROR_MSG = "🔌 I'm having trouble connecting to the AI service. This is usually temporary - please try your request again in a moment."
+
+# Substring -> user-facing message, checked in order; one table instead of
+# the same if/elif ladder duplicated across both process paths.
+_ERROR_TABLE = (
+    ("unable to connect to aws bedrock", _CONNECTION_ERROR_MSG),
+    ("connection timeout", _CONNECTION_ERROR_MSG),
+    (
+        "service temporarily unavailable",
+        "⏳ The AI service is temporarily busy. Please wait a moment and try again.",
+    ),
+    (
+        "throttling",
+        "🚦 The service is currently experiencing high demand. Please wait a moment before trying again.",
+    ),
+)
+
+_ERROR_FALLBACK_MSG = "❌ I encountered an unexpected error while processing your request. Please try again or contact support if the issue persists."
+
+
+def _classify_error(exc: Exception) -> str:
+    """Map an exception to its user-friendly message via the error table."""
+    error_str = str(exc).lower()
+    return next(
+        (msg for substr, msg in _ERROR_TABLE if substr in error_str),
+        _ERROR_FALLBACK_MSG,
+    )
+
 
 class MCPAgentManager:
     """Manager class for MCP Agent functionality"""
@@ -47,6 +98,15 @@ class MCPAgentManager:
         self.bedrock_agent = None
         self.mcp_client = None
         self.agent = None
+        # One handler reused across turns; reset() per turn instead of
+        # re-instantiating (and the error path can reach the live
+        # placeholder rather than a fresh, placeholder-less instance).
+        self.streaming_handler = StreamingHandler()
+        # Single-connection lifecycle: the stdio MCP subprocess is spawned
+        # once per session and its tool list frozen; model-parameter changes
+        # rebuild only the agent on top of the live connection.
+        self._tools_cache = None
+        self._mcp_region = None
 
     def initialize_agent(
         self,
@@ -55,40 +115,36 @@ class MCPAgentManager:
         max_tokens: int,
         temperature: float,
         streaming: bool,
+        latency_optimized: bool = False,
     ) -> bool:
         """Initialize the agent with MCP tools and Bedrock model"""
         try:
 
-            # Set up MCP client for DataProcessing
-            self.mcp_client = MCPClient(
-                lambda: stdio_client(
-                    StdioServerParameters(
-                        command="uvx",
-                        args=[
-                            "awslabs.aws-dataprocessing-mcp-server@latest",
-                            "--allow-write",
-                        ],
-                        env={
-                            "FASTMCP_LOG_LEVEL": os.getenv(
-                                "FASTMCP_LOG_LEVEL", "ERROR"
-                            ),
-                            "AWS_PROFILE": os.getenv("AWS_PROFILE", "dp-mcp"),
-                            "AWS_REGION": region,
-                        },
-                    ),
+            # Reuse the live MCP connection and cached tool list when only
+            # model parameters changed; re-spawning uvx and redoing the MCP
+            # handshake is only needed if the region differs.
+            if self._tools_cache is not None and self._mcp_region == region:
+                all_tools = self._tools_cache
+            else:
+                if self.mcp_client is not None:
+                    self.disconnect()
+
+                self.connect(region)
+
+                # Get all tools, plus a batch_execute aggregator that fans
+                # independent MCP calls out in parallel over the live session
+                dataprocessing_tools = self.mcp_client.list_tools_sync()
+                mcp_tool_names = [
+                    getattr(t, "tool_name", None) for t in dataprocessing_tools
+                ]
+                all_tools = (
+                    dataprocessing_tools
+                    + [create_batch_execute_tool(self.mcp_client, mcp_tool_names)]
+                    + create_send_email_tools()
+                    + create_s3tables_tools()
                 )
-            )
-
-            # Initialize the MCP client
-            self.mcp_client.__enter__()
-
-            # Get all tools
-            dataprocessing_tools = self.mcp_client.list_tools_sync()
-            all_tools = (
-                dataprocessing_tools
-                + create_send_email_tools()
-                + create_s3tables_tools()
-            )
+                self._tools_cache = all_tools
+                self._mcp_region = region
 
             # Create the bedrock agent
             self.bedrock_agent = StrandsBedrockAgent(
@@ -97,6 +153,7 @@ class MCPAgentManager:
                 max_tokens=max_tokens,
                 temperature=temperature,
                 streaming=streaming,
+                latency_optimized=latency_optimized,
             )
 
             # Create the agent
@@ -114,11 +171,33 @@ class MCPAgentManager:
 
         except Exception as e:
             st.error(f"Error initializing agent: {str(e)}")
-            import traceback
-
             st.code(traceback.format_exc())
             return False
 
+    def connect(self, region: str) -> None:
+        """Spawn the stdio MCP subprocess and enter its session once."""
+        self.mcp_client = MCPClient(
+            lambda: stdio_client(
+                StdioServerParameters(
+                    command="uvx",
+                    args=_MCP_ARGS,
+                    env={**_MCP_ENV, "AWS_REGION": region},
+                ),
+            )
+        )
+        self.mcp_client.__enter__()
+
+    def disconnect(self) -> None:
+        """Close the MCP session and drop the cached tool list."""
+        if self.mcp_client:
+            try:
+                self.mcp_client.__exit__(None, None, None)
+            except Exception as e:
+                print(f"Error during MCP client cleanup: {str(e)}")
+            self.mcp_client = None
+        self._tools_cache = None
+        self._mcp_region = None
+
     def process_message(
         self, user_input: str, streaming_container=None
     ) -> Dict[str, Any]:
@@ -129,12 +208,21 @@ class MCPAgentManager:
                 "thinking": "Agent not initialized.",
             }
 
+        # Deterministic artifact requests (DDL, CTAS, crawler configs) are
+        # pure functions of their wording; answer repeats from the LRU cache
+        # without a model call.
+        if prompts.is_deterministic_request(user_input):
+            cached = prompts.cached_ddl_response(user_input)
+            if cached is not None:
+                return {"content": cached, "thinking": "Served from DDL response cache."}
+
         try:
             # Get context messages (last N messages)
             context_messages = ChatHistoryManager.get_context_messages()
 
-            # Setup streaming handler with container
-            streaming_handler = StreamingHandler()
+            # Reuse the session's streaming handler for this turn
+            streaming_handler = self.streaming_handler
+            streaming_handler.reset()
 
             if st.session_state.streaming and streaming_container:
                 # Use the provided container for streaming
@@ -157,13 +245,11 @@ class MCPAgentManager:
                     self.agent, user_input, messages=context_messages
                 )
                 final_content = response.content
-                print(f"final_content: {final_content}")
-
-            # Extract thinking steps from the response
-            thinking = self._extract_thinking(final_content)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"final_content: {final_content}")
 
-            # Clean the response to remove thinking steps
-            cleaned_response = self._clean_response(final_content)
+            # Extract thinking steps and clean the response in one pass
+            thinking, cleaned_response = self._split_thinking(final_content)
 
             # Extract and format metrics
             metrics_info = self._extract_metrics(response)
@@ -173,30 +259,37 @@ class MCPAgentManager:
                 thinking, metrics_info
             )
 
+            if prompts.is_deterministic_request(user_input) and cleaned_response:
+                prompts.store_ddl_response(user_input, cleaned_response)
+
             return {"content": cleaned_response, "thinking": enhanced_thinking}
 
         except Exception as e:
             logger.error(f"Error processing message: {str(e)}", exc_info=True)
 
             # Provide user-friendly error messages
-            error_str = str(e).lower()
-            if (
-                "unable to connect to aws bedrock" in error_str
-                or "connection timeout" in error_str
-            ):
-                user_friendly_msg = "🔌 I'm having trouble connecting to the AI service. This is usually temporary - please try your request again in a moment."
-            elif "service temporarily unavailable" in error_str:
-                user_friendly_msg = "⏳ The AI service is temporarily busy. Please wait a moment and try again."
-            elif "throttling" in error_str:
-                user_friendly_msg = "🚦 The service is currently experiencing high demand. Please wait a moment before trying again."
-            else:
-                user_friendly_msg = f"❌ I encountered an unexpected error while processing your request. Please try again or contact support if the issue persists."
+            user_friendly_msg = _classify_error(e)
 
             return {
                 "content": user_friendly_msg,
                 "thinking": f"Technical Error Details:\n{str(e)}\n\nFull Traceback:\n{traceback.format_exc()}",
             }
 
+    async def aprocess_message(
+        self, user_input: str, streaming_container=None
+    ) -> Dict[str, Any]:
+        """Async counterpart to process_message.
+
+        Pushes the blocking turn onto the shared Bedrock executor so an async
+        caller (asyncio.run from Streamlit, or a batch driver) can overlap it
+        with other awaitables instead of pinning the event loop for the whole
+        generation.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _BEDROCK_EXECUTOR, self.process_message, user_input, streaming_container
+        )
+
     def process_message_with_streaming(self, user_input: str) -> Dict[str, Any]:
         """Process a user message with real-time streaming display"""
         if not self.agent or not self.bedrock_agent:
@@ -209,11 +302,12 @@ class MCPAgentManager:
             # Get context messages (last N messages)
             context_messages = ChatHistoryManager.get_context_messages()
 
-            # Setup streaming handler
-            streaming_handler = StreamingHandler()
+            # Reuse the session's streaming handler for this turn
+            streaming_handler = self.streaming_handler
+            streaming_handler.reset()
             streaming_handler.setup_placeholders()
 
-            print("DEBUG: About to call agent with streaming...")
+            logger.debug("About to call agent with streaming...")
 
             # Call the agent with streaming
             response = self.bedrock_agent.call_agent_with_retry(
@@ -223,13 +317,13 @@ class MCPAgentManager:
                 stream_callback=streaming_handler.callback_handler,
             )
 
-            print(f"DEBUG: Agent response received: {type(response)}")
+            logger.debug(f"Agent response received: {type(response)}")
 
             # If streaming didn't work, try to get content directly
             if streaming_handler.content:
                 final_content = streaming_handler.finalize()
             else:
-                print("DEBUG: No streaming content, using response.content")
+                logger.debug("No streaming content, using response.content")
                 final_content = (
                     response.content if hasattr(response, "content") else str(response)
                 )
@@ -238,11 +332,8 @@ class MCPAgentManager:
                 if streaming_handler.message_placeholder:
                     streaming_handler.message_placeholder.markdown(final_content)
 
-            # Extract thinking steps from the response
-            thinking = self._extract_thinking(final_content)
-
-            # Clean the response to remove thinking steps
-            cleaned_response = self._clean_response(final_content)
+            # Extract thinking steps and clean the response in one pass
+            thinking, cleaned_response = self._split_thinking(final_content)
 
             # Extract and format metrics
             metrics_info = self._extract_metrics(response)
@@ -260,63 +351,49 @@ class MCPAgentManager:
             )
 
             # Provide user-friendly error messages
-            error_str = str(e).lower()
-            if (
-                "unable to connect to aws bedrock" in error_str
-                or "connection timeout" in error_str
-            ):
-                user_friendly_msg = "🔌 I'm having trouble connecting to the AI service. This is usually temporary - please try your request again in a moment."
-            elif "service temporarily unavailable" in error_str:
-                user_friendly_msg = "⏳ The AI service is temporarily busy. Please wait a moment and try again."
-            elif "throttling" in error_str:
-                user_friendly_msg = "🚦 The service is currently experiencing high demand. Please wait a moment before trying again."
-            else:
-                user_friendly_msg = f"❌ I encountered an unexpected error while processing your request. Please try again or contact support if the issue persists."
+            user_friendly_msg = _classify_error(e)
 
-            # Display the user-friendly error in the streaming placeholder if available
-            streaming_handler = StreamingHandler()
-            if (
-                hasattr(streaming_handler, "message_placeholder")
-                and streaming_handler.message_placeholder
-            ):
-                streaming_handler.message_placeholder.error(user_friendly_msg)
+            # Display the user-friendly error in this turn's live placeholder
+            if self.streaming_handler.message_placeholder:
+                self.streaming_handler.message_placeholder.error(user_friendly_msg)
 
-            print(f"DEBUG: Exception in process_message_with_streaming: {str(e)}")
-            print(f"DEBUG: Traceback: {traceback.format_exc()}")
+            logger.debug(f"Exception in process_message_with_streaming: {str(e)}")
+            logger.debug(f"Traceback: {traceback.format_exc()}")
 
             return {
                 "content": user_friendly_msg,
                 "thinking": f"Technical Error Details:\n{str(e)}\n\nFull Traceback:\n{traceback.format_exc()}",
             }
 
+    def _split_thinking(self, content: str) -> tuple:
+        """Split a response into (thinking, cleaned) in one regex pass.
+
+        The previous extract/clean pair scanned the full content twice with a
+        freshly compiled pattern each; a single finditer walk collects the
+        thinking blocks and assembles the remainder from slices.
+        """
+        thinking_parts = []
+        cleaned_parts = []
+        prev_end = 0
+        for match in _THINK_RE.finditer(content):
+            thinking_parts.append(match.group(1).strip())
+            cleaned_parts.append(content[prev_end:match.start()])
+            prev_end = match.end()
+        cleaned_parts.append(content[prev_end:])
+
+        # Normalize whitespace runs so spacing is preserved in the UI;
+        # split()/join collapses whitespace in C without the regex engine
+        thinking = " ".join(" ".join(thinking_parts).split())
+        cleaned = "".join(cleaned_parts).strip()
+        return self._sanitize_markdown(thinking), self._sanitize_markdown(cleaned)
+
     def _extract_thinking(self, content: str) -> str:
         """Extract thinking steps from the response"""
-        thinking_pattern = r"<thinking>(.*?)</thinking>"
-        match = re.search(thinking_pattern, content, re.DOTALL)
-
-        if match:
-            # Ensure spaces are preserved by replacing any runs of spaces with a single space
-            thinking_text = match.group(1).strip()
-            # Fix potential space issues by normalizing whitespace
-            thinking_text = re.sub(r"\s+", " ", thinking_text)
-
-            # Sanitize markdown headers to prevent UI formatting issues
-            thinking_text = self._sanitize_markdown(thinking_text)
-
-            return thinking_text
-        return ""
+        return self._split_thinking(content)[0]
 
     def _clean_response(self, content: str) -> str:
         """Remove thinking steps from the response and sanitize markdown"""
-        # Remove thinking steps
-        cleaned = re.sub(
-            r"<thinking>.*?</thinking>", "", content, flags=re.DOTALL
-        ).strip()
-
-        # Sanitize markdown headers to prevent UI formatting issues
-        cleaned = self._sanitize_markdown(cleaned)
-
-        return cleaned
+        return self._split_thinking(content)[1]
 
     def _extract_metrics(self, response) -> Dict[str, Any]:
         """Extract metrics from the response"""
@@ -342,27 +419,16 @@ class MCPAgentManager:
                 metrics_dict["total_tokens"] = current_tokens
                 metrics_dict["total_cost"] = current_cost
 
-                # Accumulate tokens and cost in session state
-                # Parse existing accumulated tokens
-                existing_input = 0
-                existing_output = 0
-                if (
-                    isinstance(st.session_state.accumulated_tokens, str)
-                    and "Input Token" in st.session_state.accumulated_tokens
-                ):
-                    tokens_str = st.session_state.accumulated_tokens
-                    existing_input = int(
-                        tokens_str.split("Input Token: ")[1].split(",")[0].strip()
-                    )
-                    existing_output = int(tokens_str.split("Output Token: ")[1].strip())
-
-                # Add current tokens to existing totals
-                total_input = existing_input + input_token
-                total_output = existing_output + output_token
+                # Accumulate tokens and cost in session state as plain ints;
+                # parsing them back out of the display string every turn was
+                # O(n) work and a standing parse hazard.
+                st.session_state.accumulated_input_tokens += input_token
+                st.session_state.accumulated_output_tokens += output_token
 
-                # Update accumulated values
+                # Keep the legacy string form in sync for existing readers
                 st.session_state.accumulated_tokens = (
-                    f"Input Token: {total_input}, Output Token: {total_output}"
+                    f"Input Token: {st.session_state.accumulated_input_tokens}, "
+                    f"Output Token: {st.session_state.accumulated_output_tokens}"
                 )
                 st.session_state.accumulated_cost += current_cost
 
@@ -377,7 +443,8 @@ class MCPAgentManager:
             if hasattr(response.metrics, "tool_metrics"):
                 for tool_name, tool_metrics in response.metrics.tool_metrics.items():
                     # Get tool input if available
-                    print(tool_metrics)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"tool_metrics: {tool_metrics}")
                     tool_input = ""
                     call_count = tool_metrics.call_count
 
@@ -410,62 +477,38 @@ class MCPAgentManager:
 
     def _sanitize_markdown(self, text: str) -> str:
         """Sanitize markdown headers and other problematic formatting"""
-        if not text:
+        # "in" is a fast memchr-style scan; skip the regex engine entirely
+        # for the common headerless case.
+        if not text or "#" not in text:
             return text
 
-        # Convert markdown headers to bold text to prevent UI formatting issues
-        # ## Header -> **Header**
-        text = re.sub(r"^##\s+(.+)$", r"**\1**", text, flags=re.MULTILINE)
-
-        # ### Header -> **Header**
-        text = re.sub(r"^###\s+(.+)$", r"**\1**", text, flags=re.MULTILINE)
-
-        # #### Header -> **Header**
-        text = re.sub(r"^####\s+(.+)$", r"**\1**", text, flags=re.MULTILINE)
-
-        # ##### Header -> **Header**
-        text = re.sub(r"^#####\s+(.+)$", r"**\1**", text, flags=re.MULTILINE)
-
-        # ###### Header -> **Header**
-        text = re.sub(r"^######\s+(.+)$", r"**\1**", text, flags=re.MULTILINE)
-
-        # # Header -> **Header** (main headers)
-        text = re.sub(r"^#\s+(.+)$", r"**\1**", text, flags=re.MULTILINE)
-
-        # Also handle headers that might be in the middle of lines
-        text = re.sub(r"\n##\s+(.+)", r"\n**\1**", text)
-        text = re.sub(r"\n###\s+(.+)", r"\n**\1**", text)
-        text = re.sub(r"\n####\s+(.+)", r"\n**\1**", text)
-        text = re.sub(r"\n#####\s+(.+)", r"\n**\1**", text)
-        text = re.sub(r"\n######\s+(.+)", r"\n**\1**", text)
-        text = re.sub(r"\n#\s+(.+)", r"\n**\1**", text)
-
-        return text
+        # Convert markdown headers to bold text to prevent UI formatting
+        # issues (## Header -> **Header**) in a single compiled scan.
+        return _HEADER_RE.sub(r"**\2**", text)
 
     def _combine_thinking_with_metrics(
         self, thinking: str, metrics: Dict[str, Any]
     ) -> str:
         """Combine thinking steps with execution metrics"""
-        # Format metrics section
-        metrics_section = "\n📊 EXECUTION STATISTICS\n"
-        metrics_section += f"⏱️ Execution Time: {metrics['execution_time']}\n"
+        # Collect lines and join once; += on a str recopies the growing
+        # buffer for every tool on heavy multi-tool turns.
+        parts = [
+            _METRICS_HEADER,
+            f"⏱️ Execution Time: {metrics['execution_time']}",
+        ]
 
         if metrics["tools_used"]:
             tool_count = len(metrics["tools_used"])
-            metrics_section += f"🔧 {tool_count} Tools Used:\n"
-            for i, tool in enumerate(metrics["tools_used"], 1):
-                metrics_section += f"{i}. {tool}\n"
+            parts.append(f"🔧 {tool_count} Tools Used:")
+            parts.extend(
+                f"{i}. {tool}" for i, tool in enumerate(metrics["tools_used"], 1)
+            )
         else:
-            metrics_section += f"🔧 Tools Used: None"
+            parts.append("🔧 Tools Used: None")
 
-        metrics_section += "\n"
         # Combine thinking with metrics
-        return thinking + metrics_section
+        return thinking + "\n".join(parts) + "\n\n"
 
     def cleanup(self):
         """Clean up resources"""
-        if self.mcp_client:
-            try:
-                self.mcp_client.__exit__(None, None, None)
-            except Exception as e:
-                print(f"Error during MCP client cleanup: {str(e)}")
+        self.disconnect()
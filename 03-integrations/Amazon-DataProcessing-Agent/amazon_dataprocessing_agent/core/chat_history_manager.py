@@ -14,12 +14,20 @@
 
 """Chat history management for the DataProcessing Agent."""
 
+import sys
 from datetime import datetime
 from typing import Any, Dict, List
 
 import streamlit as st
 
-from ..config.constants import MAX_CONTEXT_MESSAGES
+from ..config.constants import MAX_CONTEXT_MESSAGES, trim_history
+
+# Interned payload keys/roles: identity comparison lets dict lookups in the
+# per-message formatting loop short-circuit without character compares.
+_ROLE = sys.intern("role")
+_CONTENT = sys.intern("content")
+_TEXT = sys.intern("text")
+_MODEL_ROLES = (sys.intern("user"), sys.intern("assistant"))
 
 
 class ChatHistoryManager:
@@ -27,7 +35,7 @@ class ChatHistoryManager:
 
     @staticmethod
     def add_message(role: str, content: str, thinking: str = ""):
-        """Add a message to chat history"""
+        """Add a message to chat history, summarizing any evicted entry"""
         message = {
             "role": role,
             "content": content,
@@ -37,26 +45,72 @@ class ChatHistoryManager:
         if thinking:
             message["thinking"] = thinking
 
-        st.session_state.chat_history.append(message)
+        history = st.session_state.chat_history
+
+        # The history deque is bounded; when full, the oldest entry is about
+        # to fall off the left end, so keep a compact summary of it.
+        maxlen = getattr(history, "maxlen", None)
+        if maxlen and len(history) == maxlen:
+            st.session_state.history_summaries.append(
+                ChatHistoryManager._create_summary(history[0])
+            )
+
+        history.append(message)
+
+    @staticmethod
+    def _create_summary(evicted: Dict[str, Any]) -> Dict[str, Any]:
+        """Condense an evicted message into a compact summary record"""
+        content = evicted.get("content", "")
+        if not isinstance(content, str):
+            content = str(content)
+        return {
+            "role": evicted.get("role"),
+            "summary": content[:200],
+            "timestamp": evicted.get("timestamp"),
+        }
 
     @staticmethod
     def get_context_messages() -> List[Dict[str, Any]]:
-        """Get the last N messages for context, formatted for the model"""
+        """Get the last N messages for context, formatted for the model.
+
+        Bedrock prompt caching only hits when the prompt prefix is
+        byte-identical across turns, so each history entry is rendered to the
+        exact shape {"role", "content": [{"text"}]} — never timestamps or
+        thinking — and the rendered dict is memoized on the entry so repeat
+        turns reuse the same objects instead of rebuilding them.
+        """
+        history = st.session_state.chat_history
+
+        # Reuse the whole formatted list while the history is unchanged.
+        # Length alone is not a safe key once the bounded deque is full
+        # (appends keep the length constant), so the newest entry's identity
+        # is part of the key.
+        cache_key = (len(history), id(history[-1]) if history else None)
+        cached = st.session_state.get("_ctx_cache")
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+
         # Get the last MAX_CONTEXT_MESSAGES messages
-        recent_messages = st.session_state.chat_history[-MAX_CONTEXT_MESSAGES:]
+        recent_messages = trim_history(history)
 
         # Format for the model (only user and assistant messages)
         formatted_messages = []
         for msg in recent_messages:
-            if msg["role"] in ["user", "assistant"]:
-                # Convert string content to list format for Bedrock
-                content = (
-                    [{"text": msg["content"]}]
-                    if isinstance(msg["content"], str)
-                    else msg["content"]
-                )
-                formatted_messages.append({"role": msg["role"], "content": content})
+            if msg[_ROLE] in _MODEL_ROLES:
+                formatted = msg.get("_model_payload")
+                if formatted is None:
+                    # Convert string content to list format for Bedrock
+                    # (the SDK requires a list here, not any iterable)
+                    content = (
+                        [{_TEXT: msg[_CONTENT]}]
+                        if isinstance(msg[_CONTENT], str)
+                        else msg[_CONTENT]
+                    )
+                    formatted = {_ROLE: msg[_ROLE], _CONTENT: content}
+                    msg["_model_payload"] = formatted
+                formatted_messages.append(formatted)
 
+        st.session_state._ctx_cache = (cache_key, formatted_messages)
         return formatted_messages
 
     @staticmethod
@@ -73,5 +127,7 @@ class ChatHistoryManager:
     @staticmethod
     def clear_history():
         """Clear chat history"""
-        st.session_state.chat_history = []
+        st.session_state.chat_history.clear()
+        st.session_state.history_summaries = []
         st.session_state.show_thinking = {}
+        st.session_state._ctx_cache = None
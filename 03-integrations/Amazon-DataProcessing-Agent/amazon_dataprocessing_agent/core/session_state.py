@@ -14,8 +14,42 @@
 
 """Session state management for the DataProcessing Agent."""
 
+from collections import deque
+
 import streamlit as st
 
+from ..config.constants import MAX_HISTORY_MESSAGES
+
+# One auditable table of session-state defaults, swept once per rerun.
+# Factories (not values) so mutable defaults aren't built for keys that
+# already exist. chat_history is bounded so long sessions can't grow
+# session-state memory forever; evictions land in history_summaries.
+_DEFAULTS = (
+    ("chat_history", lambda: deque(maxlen=MAX_HISTORY_MESSAGES)),
+    ("history_summaries", lambda: []),
+    ("agent", lambda: None),
+    ("initialized", lambda: False),
+    ("dataprocessing_mcp_client", lambda: None),
+    ("agent_manager", lambda: None),
+    ("show_thinking", lambda: {}),
+    ("bedrock_model_id", lambda: "us.anthropic.claude-3-7-sonnet-20250219-v1:0"),
+    ("streaming", lambda: True),
+    ("is_processing", lambda: False),
+    ("streaming_content", lambda: ""),
+    ("current_tool", lambda: None),
+    ("cancel_requested", lambda: False),
+    # Token counters are kept as ints on the hot per-turn path; the
+    # human-readable accumulated_tokens string is derived when rendering.
+    ("accumulated_input_tokens", lambda: 0),
+    ("accumulated_output_tokens", lambda: 0),
+    ("accumulated_tokens", lambda: "Input Token: 0, Output Token: 0"),
+    ("accumulated_cost", lambda: 0.0),
+    ("accumulated_manual_cost", lambda: 0.0),
+    ("manual_api_prep_time", lambda: 30),  # Default value in seconds
+    ("manual_engineer_cost", lambda: 100),  # Default value in dollars per hour
+    ("fraud_data", lambda: {}),
+)
+
 
 class SessionState:
     """Class to manage session state initialization and access"""
@@ -23,66 +57,6 @@ class SessionState:
     @staticmethod
     def initialize():
         """Initialize all session state variables"""
-        if "chat_history" not in st.session_state:
-            st.session_state.chat_history = []
-
-        if "agent" not in st.session_state:
-            st.session_state.agent = None
-
-        if "initialized" not in st.session_state:
-            st.session_state.initialized = False
-
-        if "dataprocessing_mcp_client" not in st.session_state:
-            st.session_state.dataprocessing_mcp_client = None
-
-        if "agent_manager" not in st.session_state:
-            st.session_state.agent_manager = None
-
-        if "show_thinking" not in st.session_state:
-            st.session_state.show_thinking = {}
-
-        if "bedrock_model_id" not in st.session_state:
-            st.session_state.bedrock_model_id = (
-                "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
-            )
-
-        if "streaming" not in st.session_state:
-            st.session_state.streaming = True
-
-        if "is_processing" not in st.session_state:
-            st.session_state.is_processing = False
-
-        if "streaming_content" not in st.session_state:
-            st.session_state.streaming_content = ""
-
-        if "current_tool" not in st.session_state:
-            st.session_state.current_tool = None
-
-        if "cancel_requested" not in st.session_state:
-            st.session_state.cancel_requested = False
-
-        if "accumulated_tokens" not in st.session_state:
-            st.session_state.accumulated_tokens = "Input Token: 0, Output Token: 0"
-
-        if "accumulated_cost" not in st.session_state:
-            st.session_state.accumulated_cost = 0.0
-
-        if "accumulated_manual_cost" not in st.session_state:
-            st.session_state.accumulated_manual_cost = 0.0
-
-        if "manual_api_prep_time" not in st.session_state:
-            st.session_state.manual_api_prep_time = 30  # Default value in seconds
-
-        if "manual_engineer_cost" not in st.session_state:
-            st.session_state.manual_engineer_cost = (
-                100  # Default value in dollars per hour
-            )
-
-        # Initialize fraud data
-        SessionState._initialize_fraud_data()
-
-    @staticmethod
-    def _initialize_fraud_data():
-        """Initialize fraud data in session state"""
-        if "fraud_data" not in st.session_state:
-            st.session_state.fraud_data = {}
+        for key, factory in _DEFAULTS:
+            if key not in st.session_state:
+                st.session_state[key] = factory()
@@ -14,8 +14,14 @@
 
 """Bedrock agent for handling interactions with Amazon Bedrock models."""
 
+import asyncio
+import functools
 import logging
+import random
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable, Dict, List, Optional
 
 import streamlit as st
@@ -27,12 +33,92 @@ from urllib3.exceptions import ReadTimeoutError as Urllib3ReadTimeoutError
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Shared pool for off-loop Bedrock calls; bounded so concurrent turns can't
+# pile up unbounded threads against the same runtime connection pool.
+_BEDROCK_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+class RetryableBedrockError(Exception):
+    """Transient Bedrock/transport failure that merits a retry.
+
+    Raising (or re-raising) this type lets the retry loop classify the
+    error with one isinstance check instead of stringifying the exception
+    and scanning its message.
+    """
+
+
+# Transient-error markers compiled into one alternation; a single regex
+# search replaces seven sequential substring scans per exception.
+_RETRYABLE_RE = re.compile(
+    "|".join(
+        map(
+            re.escape,
+            (
+                "modelstreamerrorexception",
+                "throttling",
+                "timeout",
+                "unexpected error",
+                "read timed out",
+                "connection pool",
+                "awshttpsconnectionpool",
+            ),
+        )
+    )
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _get_bedrock_model(
+    model_id: str,
+    region: str,
+    max_tokens: int,
+    temperature: float,
+    streaming: bool,
+    latency_optimized: bool = False,
+) -> BedrockModel:
+    """Build (or reuse) a BedrockModel for a parameter combination.
+
+    Model construction loads botocore data and opens an HTTPS pool, so
+    re-initializing the agent with unchanged parameters should not pay
+    that cost again across Streamlit reruns.
+    """
+    additional_request_fields = {
+        "thinking": {
+            "type": "enabled",
+            "budget_tokens": 2048,  # Reduced thinking budget for faster responses
+        }
+    }
+    additional_args = None
+    if latency_optimized:
+        # Latency-optimized inference lowers TTFT and total generation
+        # time on supported models with no agent-loop changes.
+        # performanceConfig is a top-level Converse parameter, so it goes
+        # through additional_args (spread into the request root), not
+        # additional_request_fields (the model body). Unsupported
+        # model/region combinations reject the field, so the toggle is
+        # opt-in.
+        additional_args = {"performanceConfig": {"latency": "optimized"}}
+    return BedrockModel(
+        model_id=model_id,
+        region_name=region,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        streaming=streaming,
+        additional_args=additional_args,
+        # cache_prompt is a cachePoint type, not a cache key; "default" is
+        # the only value the Converse API accepts. Bedrock derives prompt-
+        # cache hits from the prefix content itself.
+        cache_prompt="default",
+        cache_tools="default",
+        additional_request_fields=additional_request_fields,
+    )
+
 
 class StrandsBedrockAgent:
     """Class to handle interactions with Amazon Bedrock models"""
 
     MAX_RETRIES = 3
     INITIAL_RETRY_DELAY = 2  # seconds
+    MAX_RETRY_DELAY = 30  # seconds; cap for jittered backoff
 
     def __init__(
         self,
@@ -41,6 +127,7 @@ class StrandsBedrockAgent:
         max_tokens: int = 8000,
         temperature: float = 1.0,
         streaming: bool = True,
+        latency_optimized: bool = False,
     ):
         """Initialize the Bedrock agent with model parameters"""
         self.model_id = model_id
@@ -48,22 +135,31 @@ class StrandsBedrockAgent:
         self.max_tokens = max_tokens
         self.temperature = temperature
         self.streaming = streaming
-        self.model = BedrockModel(
-            model_id=model_id,
-            region_name=region,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            streaming=streaming,
-            cache_prompt="default",
-            cache_tools="default",
-            additional_request_fields={
-                "thinking": {
-                    "type": "enabled",
-                    "budget_tokens": 2048,  # Reduced thinking budget for faster responses
-                }
-            },
+        self.latency_optimized = latency_optimized
+        # Set from the UI to abort a backoff sleep mid-wait instead of
+        # pinning the session thread for the full delay.
+        self._cancel = threading.Event()
+        self.model = _get_bedrock_model(
+            model_id,
+            region,
+            max_tokens,
+            temperature,
+            streaming,
+            latency_optimized,
         )
 
+    def _backoff_delay(self, attempt: int, initial_delay: int) -> float:
+        """Jittered exponential backoff delay for a retry attempt.
+
+        Full jitter decorrelates retries across concurrent sessions so
+        throttled callers don't all hammer Bedrock again in lockstep.
+        """
+        return random.uniform(0, min(self.MAX_RETRY_DELAY, initial_delay * (2 ** attempt)))
+
+    def cancel(self) -> None:
+        """Abort any in-progress retry backoff for this agent."""
+        self._cancel.set()
+
     def call_agent_with_retry(
         self,
         agent: Callable,
@@ -74,7 +170,7 @@ class StrandsBedrockAgent:
         initial_delay: int = INITIAL_RETRY_DELAY,
     ) -> Any:
         """Call the agent with retry logic for handling transient errors"""
-        retry_delay = initial_delay
+        self._cancel.clear()
         last_exception = None
 
         for attempt in range(max_retries):
@@ -110,49 +206,76 @@ class StrandsBedrockAgent:
                 )
 
                 if attempt < max_retries - 1:
+                    retry_delay = self._backoff_delay(attempt, initial_delay)
                     st.warning(
-                        f"🔄 Connection timeout, retrying in {retry_delay} seconds (attempt {attempt+1}/{max_retries})..."
+                        f"🔄 Connection timeout, retrying in {retry_delay:.1f} seconds (attempt {attempt+1}/{max_retries})..."
                     )
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
+                    if self._cancel.wait(retry_delay):
+                        raise Exception("Request cancelled during retry backoff") from e
                     continue
                 else:
                     # Final attempt failed, show user-friendly error
                     error_msg = "Unable to connect to AWS Bedrock service after multiple attempts. Please check your internet connection and try again."
                     logger.error(f"All retry attempts failed: {str(e)}")
-                    raise Exception(error_msg) from e
+                    raise RetryableBedrockError(error_msg) from e
 
             except Exception as e:
                 last_exception = e
-                error_str = str(e).lower()
-
-                # Check if it's a retryable error
-                if (
-                    "modelstreamerrorexception" in error_str
-                    or "throttling" in error_str
-                    or "timeout" in error_str
-                    or "unexpected error" in error_str
-                    or "read timed out" in error_str
-                    or "connection pool" in error_str
-                    or "awshttpsconnectionpool" in error_str
+
+                # Typed transient errors skip the stringify-and-scan path;
+                # everything else falls back to the message markers.
+                if isinstance(e, RetryableBedrockError) or _RETRYABLE_RE.search(
+                    str(e).lower()
                 ):
                     logger.warning(
                         f"Retryable error on attempt {attempt + 1}: {str(e)}"
                     )
 
                     if attempt < max_retries - 1:
+                        retry_delay = self._backoff_delay(attempt, initial_delay)
                         st.warning(
-                            f"🔄 Temporary service issue, retrying in {retry_delay} seconds (attempt {attempt+1}/{max_retries})..."
+                            f"🔄 Temporary service issue, retrying in {retry_delay:.1f} seconds (attempt {attempt+1}/{max_retries})..."
                         )
-                        time.sleep(retry_delay)
-                        retry_delay *= 2  # Exponential backoff
+                        if self._cancel.wait(retry_delay):
+                            raise Exception(
+                                "Request cancelled during retry backoff"
+                            ) from e
                         continue
                     else:
                         # Final attempt failed, show user-friendly error
                         error_msg = "Service temporarily unavailable after multiple attempts. Please try again in a few moments."
                         logger.error(f"All retry attempts failed: {str(e)}")
-                        raise Exception(error_msg) from e
+                        raise RetryableBedrockError(error_msg) from e
 
                 # Non-retryable error, log and re-raise immediately
                 logger.error(f"Non-retryable error: {str(e)}")
                 raise last_exception
+
+    async def a_call_agent_with_retry(
+        self,
+        agent: Callable,
+        prompt: str,
+        messages: Optional[List[Dict[str, Any]]] = None,
+        stream_callback: Optional[Callable] = None,
+        max_retries: int = MAX_RETRIES,
+        initial_delay: int = INITIAL_RETRY_DELAY,
+    ) -> Any:
+        """Run call_agent_with_retry off the event loop.
+
+        boto3 is synchronous, so the blocking call is pushed onto a bounded
+        executor; an async caller can overlap it with other awaitables
+        (another model call, tool warmup) via asyncio.gather.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _BEDROCK_EXECUTOR,
+            functools.partial(
+                self.call_agent_with_retry,
+                agent,
+                prompt,
+                messages=messages,
+                stream_callback=stream_callback,
+                max_retries=max_retries,
+                initial_delay=initial_delay,
+            ),
+        )
@@ -14,21 +14,47 @@
 
 """Streaming handler for real-time LLM responses."""
 
+import logging
 import re
 import time
 
 import streamlit as st
 
+logger = logging.getLogger(__name__)
+
+# ATX headers of any level at line start; the MULTILINE anchor also covers
+# the mid-string "\n## ..." cases, collapsing the previous 12 re.sub passes
+# into one compiled scan per call.
+_HDR_RE = re.compile(r"^(#{1,6})\s+(.+)$", re.MULTILINE)
+
 
 class StreamingHandler:
     """Handle streaming responses from the LLM using Strands callback handlers"""
 
+    # Floor between placeholder rerenders. Bedrock can emit deltas far
+    # faster than Streamlit can repaint; pushing every delta causes a
+    # rerender storm where the websocket queue, not the model, bounds
+    # perceived latency. 50 ms still reads as smooth streaming, and tool
+    # and completion events force a flush so nothing lags behind.
+    MIN_RENDER_INTERVAL = 0.05
+
     def __init__(self):
-        self.content = ""
+        # Chunks are buffered in a list and joined lazily; += on a str
+        # re-copies the ever-growing buffer once per token.
+        self._chunks = []
+        self._content_cache = ""
+        self._content_dirty = False
         self.message_placeholder = None
         self.tool_placeholder = None
         self.current_tool = None
         self.tool_count = 0
+        self._last_render = 0.0
+        # Incremental sanitization state: completed lines already sanitized,
+        # plus the trailing partial line not yet ended by a newline. Keeps
+        # per-chunk work O(chunk) instead of re-scanning the whole buffer.
+        self._safe_prefix = ""
+        self._pending_tail = ""
+        self._error_count = 0
 
     def setup_placeholders(self):
         """Setup placeholders for streaming content using Streamlit chat"""
@@ -38,65 +64,117 @@ class StreamingHandler:
         self.tool_placeholder = st.empty()
 
     def callback_handler(self, **kwargs):
-        """Strands callback handler for streaming responses"""
+        """Strands callback handler for streaming responses.
+
+        Dispatches on the event type once and returns early - each callback
+        carries one event, so running every check per token only added dict
+        lookups to the hottest method.
+        """
         try:
-            # Handle text generation events
             if "data" in kwargs:
-                text_chunk = kwargs["data"]
-                self.content += text_chunk
-                # print(f"DEBUG: Text chunk: '{text_chunk}'")
-
-                # Update UI with streaming content
-                if self.message_placeholder:
-                    self.message_placeholder.markdown(
-                        self._sanitize_markdown(self.content) + "\n"
-                    )
+                self._on_data(kwargs["data"])
+                if kwargs.get("complete", False):
+                    self._on_complete()
+                return
 
-            # Handle tool usage events
             if "current_tool_use" in kwargs and kwargs["current_tool_use"].get("name"):
-                tool_name = kwargs["current_tool_use"]["name"]
-                if tool_name != self.current_tool:
-                    self.current_tool = tool_name
-                    self.tool_count += 1
-                    print(f"DEBUG: Tool started: {tool_name}")
-
-                    if self.tool_placeholder:
-                        self.tool_placeholder.info(
-                            f"🔧 **Tool #{self.tool_count}:** {tool_name} - Running..."
-                        )
-
-            # Handle completion events
+                self._on_tool_use(kwargs["current_tool_use"]["name"])
+                return
+
             if kwargs.get("complete", False):
-                print("DEBUG: Stream completed")
-                if self.tool_placeholder and self.current_tool:
-                    self.tool_placeholder.success(
-                        f"✅ **Tool #{self.tool_count}:** {self.current_tool} - Completed!"
-                    )
-                    time.sleep(0.5)
-                    self.tool_placeholder.empty()
-                self.current_tool = None
-
-            # Handle lifecycle events for debugging
+                self._on_complete()
+                return
+
+            # Lifecycle events, debug only
             if kwargs.get("init_event_loop", False):
-                print("DEBUG: 🔄 Event loop initialized")
+                logger.debug("Event loop initialized")
             elif kwargs.get("start_event_loop", False):
-                print("DEBUG: ▶️ Event loop cycle starting")
+                logger.debug("Event loop cycle starting")
             elif kwargs.get("start", False):
-                print("DEBUG: 📝 New cycle started")
+                logger.debug("New cycle started")
             elif "message" in kwargs:
-                print(
-                    f"DEBUG: 📬 New message created: {kwargs['message'].get('role', 'unknown')}"
+                logger.debug(
+                    "New message created: %s", kwargs["message"].get("role", "unknown")
                 )
             elif kwargs.get("force_stop", False):
-                print(
-                    f"DEBUG: 🛑 Event loop force-stopped: {kwargs.get('force_stop_reason', 'unknown reason')}"
+                logger.debug(
+                    "Event loop force-stopped: %s",
+                    kwargs.get("force_stop_reason", "unknown reason"),
+                )
+
+        except Exception:
+            # Full traceback for the first failure only; a repeating bug in
+            # a per-token callback would otherwise flood the log with
+            # freshly formatted tracebacks every event.
+            self._error_count += 1
+            if self._error_count == 1:
+                logger.exception("Streaming callback error")
+            else:
+                logger.debug(
+                    "Streaming callback error repeated (%d total)", self._error_count
                 )
 
-        except Exception as e:
-            print(f"Streaming callback error: {str(e)}")
-            import traceback
+    def _on_data(self, text_chunk: str):
+        """Handle a text generation delta"""
+        self._chunks.append(text_chunk)
+        self._content_dirty = True
+
+        # Sanitize incrementally: once a line is complete it can't change,
+        # so only newly completed lines go through the header regex; the
+        # partial tail is sanitized at render.
+        self._pending_tail += text_chunk
+        if "\n" in self._pending_tail:
+            done, _, rest = self._pending_tail.rpartition("\n")
+            self._safe_prefix += self._sanitize_markdown(done + "\n")
+            self._pending_tail = rest
+
+        # Update UI with streaming content. The first chunk renders
+        # immediately (TTFT); subsequent repaints are throttled, with
+        # finalize() guaranteeing the complete text lands.
+        if time.monotonic() - self._last_render >= self.MIN_RENDER_INTERVAL:
+            self._flush()
+
+    def _on_tool_use(self, tool_name: str):
+        """Handle a tool starting"""
+        if tool_name != self.current_tool:
+            # Make sure buffered text is visible before the tool note
+            self._flush()
+            self.current_tool = tool_name
+            self.tool_count += 1
+            logger.debug("Tool started: %s", tool_name)
+
+            if self.tool_placeholder:
+                self.tool_placeholder.info(
+                    f"\U0001f527 **Tool #{self.tool_count}:** {tool_name} - Running..."
+                )
+
+    def _on_complete(self):
+        """Handle stream completion"""
+        logger.debug("Stream completed")
+        self._flush()
+        if self.tool_placeholder and self.current_tool:
+            self.tool_placeholder.success(
+                f"\u2705 **Tool #{self.tool_count}:** {self.current_tool} - Completed!"
+            )
+            time.sleep(0.5)
+            self.tool_placeholder.empty()
+        self.current_tool = None
+
+    @property
+    def content(self) -> str:
+        """Full accumulated response text, joined on demand and cached"""
+        if self._content_dirty:
+            self._content_cache = "".join(self._chunks)
+            self._content_dirty = False
+        return self._content_cache
 
-            print(f"Traceback: {traceback.format_exc()}")
+    def _flush(self):
+        """Render the current buffer to the placeholder unconditionally"""
+        if self.message_placeholder:
+            self._last_render = time.monotonic()
+            self.message_placeholder.markdown(
+                self._safe_prefix + self._sanitize_markdown(self._pending_tail) + "\n"
+            )
 
     def finalize(self):
         """Finalize streaming and return content"""
@@ -108,41 +186,31 @@ class StreamingHandler:
         return self.content
 
     def reset(self):
-        """Reset streaming state"""
-        self.content = ""
+        """Reset streaming state for the next turn.
+
+        Placeholder refs are dropped as well: Streamlit recreates the DOM on
+        each rerun, so holding on to last turn's placeholders would write
+        into stale containers. setup_placeholders() provides fresh ones.
+        """
+        self._chunks = []
+        self._content_cache = ""
+        self._content_dirty = False
         self.current_tool = None
         self.tool_count = 0
+        self._last_render = 0.0
+        self._safe_prefix = ""
+        self._pending_tail = ""
+        self._error_count = 0
+        self.message_placeholder = None
+        self.tool_placeholder = None
 
     def _sanitize_markdown(self, text: str) -> str:
         """Sanitize markdown headers and other problematic formatting"""
-        if not text:
+        # Skip all regex work when no header marker is present - the common
+        # case for short streamed chunks.
+        if not text or "#" not in text:
             return text
 
-        # Convert markdown headers to bold text to prevent UI formatting issues
-        # ## Header -> **Header**
-        text = re.sub(r"^##\s+(.+)$", r"**\1**", text, flags=re.MULTILINE)
-
-        # ### Header -> **Header**
-        text = re.sub(r"^###\s+(.+)$", r"**\1**", text, flags=re.MULTILINE)
-
-        # #### Header -> **Header**
-        text = re.sub(r"^####\s+(.+)$", r"**\1**", text, flags=re.MULTILINE)
-
-        # ##### Header -> **Header**
-        text = re.sub(r"^#####\s+(.+)$", r"**\1**", text, flags=re.MULTILINE)
-
-        # ###### Header -> **Header**
-        text = re.sub(r"^######\s+(.+)$", r"**\1**", text, flags=re.MULTILINE)
-
-        # # Header -> **Header** (main headers)
-        text = re.sub(r"^#\s+(.+)$", r"**\1**", text, flags=re.MULTILINE)
-
-        # Also handle headers that might be in the middle of lines
-        text = re.sub(r"\n##\s+(.+)", r"\n**\1**", text)
-        text = re.sub(r"\n###\s+(.+)", r"\n**\1**", text)
-        text = re.sub(r"\n####\s+(.+)", r"\n**\1**", text)
-        text = re.sub(r"\n#####\s+(.+)", r"\n**\1**", text)
-        text = re.sub(r"\n######\s+(.+)", r"\n**\1**", text)
-        text = re.sub(r"\n#\s+(.+)", r"\n**\1**", text)
-
-        return text
+        # Convert markdown headers to bold text to prevent UI formatting
+        # issues (## Header -> **Header**)
+        return _HDR_RE.sub(r"**\2**", text)
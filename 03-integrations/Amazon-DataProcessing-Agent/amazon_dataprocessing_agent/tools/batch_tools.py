@@ -0,0 +1,114 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Batch execution aggregator tool for the DataProcessing Agent."""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import List
+
+from strands import tool
+
+
+def create_batch_execute_tool(mcp_client, tool_names: List[str], max_concurrent: int = 4):
+    """Create a batch_execute tool fanning out over the live MCP session.
+
+    The stdio transport serializes one request/response pair per agent turn,
+    so N independent tool calls cost N model round trips. batch_execute lets
+    the model schedule them as a single call; the fan-out happens here
+    against the already-open client, bounded by max_concurrent workers.
+    """
+    available = frozenset(tool_names)
+
+    @tool
+    def batch_execute(invocations: list, timeout_ms: int = 60000) -> str:
+        """
+        Execute several independent MCP tool calls in parallel.
+
+        Use this when multiple tool calls do not depend on each other's
+        output (e.g. listing Glue jobs, crawlers, and Athena workgroups in
+        one step). Calls whose input depends on another call's result must
+        still be issued sequentially.
+
+        Args:
+            invocations: List of {"tool": <tool name>, "args": {<arguments>}}
+                entries, one per call to run
+            timeout_ms: Overall deadline in milliseconds for the whole batch
+
+        Returns:
+            JSON list with one {"tool", "status", "content"} entry per
+            invocation, in the same order as the input
+        """
+        if not invocations:
+            return "❌ Error: invocations must be a non-empty list"
+
+        def _call(index: int, spec: dict) -> dict:
+            name = spec.get("tool")
+            args = spec.get("args") or {}
+            if name not in available:
+                return {
+                    "tool": name,
+                    "status": "error",
+                    "content": f"Unknown tool '{name}'",
+                }
+            result = mcp_client.call_tool_sync(
+                tool_use_id=f"batch-{index}-{name}", name=name, arguments=args
+            )
+            return {
+                "tool": name,
+                "status": result.get("status", "success"),
+                "content": result.get("content", []),
+            }
+
+        deadline = time.monotonic() + (timeout_ms / 1000.0)
+        workers = min(max_concurrent, len(invocations))
+        results = []
+        # No context manager: its exit joins every worker, which would block
+        # the return until stragglers finish and void the deadline.
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = [
+                executor.submit(_call, index, spec)
+                for index, spec in enumerate(invocations)
+            ]
+            for future, spec in zip(futures, invocations):
+                remaining = max(deadline - time.monotonic(), 0.0)
+                try:
+                    results.append(future.result(timeout=remaining))
+                except FutureTimeoutError:
+                    results.append(
+                        {
+                            "tool": spec.get("tool"),
+                            "status": "timeout",
+                            "content": f"No result within {timeout_ms} ms",
+                        }
+                    )
+                except Exception as e:
+                    results.append(
+                        {
+                            "tool": spec.get("tool"),
+                            "status": "error",
+                            "content": str(e),
+                        }
+                    )
+        finally:
+            # Return at the deadline: drop queued calls and leave any
+            # in-flight ones to finish on their daemon-joined threads.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return json.dumps(results, default=str)
+
+    return batch_execute
@@ -14,29 +14,72 @@
 
 """Email tools for the DataProcessing Agent."""
 
+import functools
+import logging
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 import boto3
 from botocore.exceptions import ClientError
 from strands import tool
 
+logger = logging.getLogger(__name__)
+
+# Sends run off the agent loop so a slow SES round trip doesn't freeze
+# token streaming; the tool waits briefly, then reports the send as queued.
+_EMAIL_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+_SEND_WAIT_SECONDS = 2.0
+
+
+# One shared Session: boto3.client() at module level would create a fresh
+# implicit Session per call, re-walking the credential chain and re-parsing
+# endpoint data for every client.
+_SESSION = boto3.session.Session()
+
+
+@functools.lru_cache(maxsize=4)
+def _ses_client(region: str):
+    """Return a cached SES client for the region.
+
+    Client construction loads botocore data files and builds the endpoint
+    and auth chain - far too heavy to repeat on every send in an agent loop.
+    """
+    return _SESSION.client("ses", region_name=region)
+
+
+# Any run of newlines becomes one blank line; a single substitution pass
+# instead of chained str.replace copies of the whole body.
+_NL_RE = re.compile(r"\n+")
+
 
 def create_send_email_tools():
     """Create and return the send_email tool"""
+    # Resolve configuration once at registration; per-call env lookups only
+    # masked a missing sender until the first actual send.
+    region = os.getenv("AWS_REGION", "us-east-1")
+    sender = os.getenv("SENDER_EMAIL_ADDRESS")
+    reply_to = os.getenv("REPLY_TO_EMAIL_ADDRESSES", sender)
+    if not sender:
+        logger.warning(
+            "SENDER_EMAIL_ADDRESS is not set; send_email will report the "
+            "misconfiguration instead of sending"
+        )
 
     @tool
     def send_email(to_address: str, subject: str, body: str) -> str:
         """Send a plain text email using Amazon SES via boto3."""
+        if not sender:
+            return "❌ Error sending email: SENDER_EMAIL_ADDRESS is not configured"
+
         try:
-            # Create a new SES client
-            ses_client = boto3.client(
-                "ses", region_name=os.getenv("AWS_REGION", "us-east-1")
-            )
+            # Reuse the cached SES client for this region
+            ses_client = _ses_client(region)
 
-            # Format the text body for better readability
-            formatted_body = body.strip()
-            formatted_body = formatted_body.replace("\n\n\n", "\n\n")
-            formatted_body = formatted_body.replace("\n", "\n\n")
+            # Format the text body for better readability: every newline
+            # run becomes exactly one blank line
+            formatted_body = _NL_RE.sub("\n\n", body.strip())
 
             # Prepare the email message
             message = {
@@ -44,19 +87,30 @@ def create_send_email_tools():
                 "Body": {"Text": {"Data": formatted_body}},
             }
 
-            # Send the email
-            response = ses_client.send_email(
-                Source=os.getenv("SENDER_EMAIL_ADDRESS"),
+            # Send the email off-thread; don't block the agent loop on the
+            # full SES round trip
+            future = _EMAIL_EXECUTOR.submit(
+                ses_client.send_email,
+                Source=sender,
                 Destination={"ToAddresses": [to_address]},
                 Message=message,
-                ReplyToAddresses=[
-                    os.getenv(
-                        "REPLY_TO_EMAIL_ADDRESSES",
-                        os.getenv("SENDER_EMAIL_ADDRESS"),
-                    )
-                ],
+                ReplyToAddresses=[reply_to],
             )
 
+            try:
+                response = future.result(timeout=_SEND_WAIT_SECONDS)
+            except FutureTimeoutError:
+                # The send continues in the background; report it as queued
+                # and log any late failure, which would otherwise vanish
+                # with the abandoned future.
+                def _log_late_failure(done, _to=to_address):
+                    exc = done.exception()
+                    if exc is not None:
+                        logger.error("Background SES send to %s failed: %s", _to, exc)
+
+                future.add_done_callback(_log_late_failure)
+                return f"📨 Email to {to_address} queued; SES is still processing the send."
+
             return f"✅ Email sent successfully to {to_address}! Message ID: {response['MessageId']}"
 
         except Exception as e:
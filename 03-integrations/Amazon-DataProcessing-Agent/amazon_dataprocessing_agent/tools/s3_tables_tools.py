@@ -14,16 +14,38 @@
 
 """S3 Tables tools for the DataProcessing Agent."""
 
+import functools
+import json
+import os
 from typing import Any, Dict, List, Optional
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from strands import tool
 
 
+@functools.lru_cache(maxsize=8)
+def _s3tables_client(region: str):
+    """Return a cached S3 Tables client for the region.
+
+    Building a client per tool call repeats credential resolution and
+    endpoint discovery and discards the HTTPS pool; caching keeps TCP/TLS
+    sessions warm across invocations. boto3 clients are thread-safe, so
+    one instance per region serves concurrent tool calls.
+    """
+    return boto3.client(
+        "s3tables",
+        region_name=region,
+        config=Config(
+            max_pool_connections=50,
+            retries={"mode": "adaptive", "max_attempts": 5},
+        ),
+    )
+
+
 def create_s3tables_tools():
     """Create and return S3 Tables tools"""
-    from botocore.exceptions import ClientError
 
     @tool
     def manage_s3_table_buckets(
@@ -68,10 +90,8 @@ def create_s3tables_tools():
             continuation_token: Token for pagination
         """
         try:
-            # Create S3 Tables client
-            s3tables_client = boto3.client(
-                "s3tables", region_name=os.getenv("AWS_REGION", "us-east-1")
-            )
+            # Reuse the cached S3 Tables client for this region
+            s3tables_client = _s3tables_client(os.getenv("AWS_REGION", "us-east-1"))
 
             if operation == "create_table_bucket":
                 if not table_bucket_name:
@@ -260,9 +280,7 @@ def create_s3tables_tools():
             continuation_token: Token for pagination
         """
         try:
-            s3tables_client = boto3.client(
-                "s3tables", region_name=os.getenv("AWS_REGION", "us-east-1")
-            )
+            s3tables_client = _s3tables_client(os.getenv("AWS_REGION", "us-east-1"))
 
             if operation == "create_namespace":
                 if not namespace:
@@ -397,9 +415,7 @@ def create_s3tables_tools():
             continuation_token: Token for pagination
         """
         try:
-            s3tables_client = boto3.client(
-                "s3tables", region_name=os.getenv("AWS_REGION", "us-east-1")
-            )
+            s3tables_client = _s3tables_client(os.getenv("AWS_REGION", "us-east-1"))
 
             if operation == "create_table":
                 if not all([table_bucket_arn, namespace, table_name, table_format]):
@@ -17,6 +17,7 @@
 from typing import Any, Dict, List, Optional
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 
@@ -24,8 +25,20 @@ class S3Tools:
     """Tools for interacting with Amazon S3"""
 
     def __init__(self, region_name: str = "us-east-1"):
-        """Initialize S3 client"""
-        self.s3_client = boto3.client("s3", region_name=region_name)
+        """Initialize S3 client.
+
+        The client is configured with a connection pool sized for fan-out:
+        botocore's default of 10 pooled connections serializes anything
+        beyond 10 concurrent requests. boto3 clients (unlike resources) are
+        thread-safe, so a single S3Tools instance can be shared across a
+        ThreadPoolExecutor for parallel uploads/downloads without locking.
+        """
+        config = Config(
+            max_pool_connections=64,
+            tcp_keepalive=True,
+            retries={"mode": "adaptive", "max_attempts": 10},
+        )
+        self.s3_client = boto3.client("s3", region_name=region_name, config=config)
         self.region_name = region_name
 
     def list_buckets(self) -> List[Dict[str, Any]]:
@@ -20,7 +20,8 @@ from datetime import datetime
 
 import streamlit as st
 
-from amazon_dataprocessing_agent.config.constants import PAGE_STYLE
+from amazon_dataprocessing_agent.config.constants import (PAGE_STYLE,
+                                                           PAGE_STYLE_GZIP_B64)
 from amazon_dataprocessing_agent.core.chat_history_manager import \
     ChatHistoryManager
 
@@ -29,6 +30,34 @@ TEMPERATURE = 1.0
 MAX_TOKENS = 4000
 
 
+@st.cache_resource
+def _style_injector_html() -> str:
+    """Build the one-time style injector markup.
+
+    Ships the CSS as a gzip+base64 blob that the browser inflates with
+    DecompressionStream and appends as a style tag once; on later reruns the
+    cached markup is byte-identical and the client-side guard no-ops, so the
+    websocket carries the small script instead of the full stylesheet diff.
+
+    components.html renders inside a sandboxed same-origin iframe, so the
+    script must reach through window.parent to style the actual app page -
+    appending to the iframe's own head would style nothing visible.
+    """
+    return (
+        '<script>(async () => {'
+        'const doc = window.parent.document;'
+        'if (doc.getElementById("dpa-style")) return;'
+        f'const bytes = Uint8Array.from(atob("{PAGE_STYLE_GZIP_B64}"), c => c.charCodeAt(0));'
+        'const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("gzip"));'
+        'const css = await new Response(stream).text();'
+        'const tag = doc.createElement("style");'
+        'tag.id = "dpa-style";'
+        'tag.textContent = css.replace(/^<style>/, "").replace(/<\\/style>$/, "");'
+        'doc.head.appendChild(tag);'
+        '})();</script>'
+    )
+
+
 class UIComponents:
     """Class to handle UI components and rendering"""
 
@@ -42,8 +71,14 @@ class UIComponents:
             initial_sidebar_state="expanded",
         )
 
-        # Apply custom CSS
-        st.markdown(PAGE_STYLE, unsafe_allow_html=True)
+        # Apply custom CSS via the compressed one-shot injector; fall back to
+        # plain markdown injection if components are unavailable.
+        try:
+            import streamlit.components.v1 as components
+
+            components.html(_style_injector_html(), height=0)
+        except Exception:
+            st.markdown(PAGE_STYLE, unsafe_allow_html=True)
 
         # Main header
         st.markdown(
@@ -65,23 +100,9 @@ class UIComponents:
                 # Display usage statistics
                 st.markdown("### 📊 Usage Statistics")
 
-                # Parse token information consistently
-                input_tokens = 0
-                output_tokens = 0
-
-                if (
-                    isinstance(st.session_state.accumulated_tokens, str)
-                    and "Input Token" in st.session_state.accumulated_tokens
-                ):
-                    tokens_str = st.session_state.accumulated_tokens
-                    input_tokens = int(
-                        tokens_str.split("Input Token: ")[1].split(",")[0].strip()
-                    )
-                    output_tokens = int(tokens_str.split("Output Token: ")[1].strip())
-                elif isinstance(st.session_state.accumulated_tokens, (int, float)):
-                    # When only total is available, show it as input tokens for consistency
-                    input_tokens = int(st.session_state.accumulated_tokens)
-                    output_tokens = 0
+                # Counters are maintained as ints in session state
+                input_tokens = st.session_state.get("accumulated_input_tokens", 0)
+                output_tokens = st.session_state.get("accumulated_output_tokens", 0)
 
                 # Display tokens side by side
                 col1, col2 = st.columns(2)
@@ -146,7 +167,14 @@ class UIComponents:
 
             with col2:
                 if st.session_state.chat_history:
-                    chat_export = json.dumps(st.session_state.chat_history, indent=2)
+                    # Drop memoized private fields (e.g. _model_payload)
+                    chat_export = json.dumps(
+                        [
+                            {k: v for k, v in msg.items() if not k.startswith("_")}
+                            for msg in st.session_state.chat_history
+                        ],
+                        indent=2,
+                    )
                     st.download_button(
                         "📥 Export Chat",
                         chat_export,
@@ -245,6 +273,9 @@ class UIComponents:
             if st.session_state.is_processing:
                 st.session_state.cancel_requested = True
                 st.session_state.is_processing = False
+                # Break out of any retry backoff the agent is sleeping in
+                if agent_manager.bedrock_agent:
+                    agent_manager.bedrock_agent.cancel()
                 st.warning("🛑 Request cancelled by user")
                 st.rerun()
             elif user_input.strip():